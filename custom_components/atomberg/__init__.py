@@ -2,22 +2,33 @@
 
 from __future__ import annotations
 
+from logging import getLogger
+from typing import Any
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_KEY, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryError, ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
 from .api import AtombergCloudAPI
 from .const import (
+    API_CLIENTS,
     CONF_CONTROL_METHOD,
     CONF_REFRESH_TOKEN,
     DOMAIN,
     ENTRIES,
     UDP_LISTENER,
+    UDP_SENDER,
     ControlMethod,
 )
 from .coordinator import AtombergDataUpdateCoordinator
+from .services import async_setup_services
 from .udp_listener import UDPListener
+from .udp_sender import UDPSender
+
+_LOGGER = getLogger(__name__)
 
 CLOUD_PLATFORMS: list[Platform] = [
     Platform.FAN,
@@ -32,6 +43,14 @@ IR_PLATFORMS: list[Platform] = [
     Platform.BUTTON,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up Atomberg services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Atomberg from a config entry."""
@@ -45,38 +64,79 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def _async_setup_cloud_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Atomberg using cloud API."""
-    domain_data = hass.data.setdefault(DOMAIN, {UDP_LISTENER: None, ENTRIES: {}})
-
-    api = AtombergCloudAPI(
-        hass, entry.data[CONF_API_KEY], entry.data[CONF_REFRESH_TOKEN]
+    domain_data = hass.data.setdefault(
+        DOMAIN, {UDP_LISTENER: None, UDP_SENDER: None, ENTRIES: {}, API_CLIENTS: {}}
     )
 
-    try:
-        await api.test_connection()
-    except Exception as e:
-        raise ConfigEntryNotReady("Failed to initialize Atomberg integration.") from e
+    # Entries of the same account share the client, its token, rate limit and devices
+    api_key = entry.data[CONF_API_KEY]
+    sync_in_background = False
+    if api := domain_data[API_CLIENTS].get(api_key):
+        _LOGGER.debug("Reusing Atomberg Cloud API client of another entry")
+        new_api = None
+    else:
+        new_api = api = AtombergCloudAPI(hass, api_key, entry.data[CONF_REFRESH_TOKEN])
+        # Start from the stored snapshot and sync with cloud afterwards
+        if await api.async_load_snapshot():
+            sync_in_background = True
+        else:
+            try:
+                await api.test_connection()
+            except Exception as e:
+                api.async_shutdown()
+                raise ConfigEntryNotReady(
+                    "Failed to initialize Atomberg integration."
+                ) from e
 
-    if not domain_data[UDP_LISTENER]:
-        udp_listener = UDPListener(hass)
-        domain_data[UDP_LISTENER] = udp_listener
+    try:
+        udp_listener, udp_sender = await _async_start_udp(hass, domain_data)
+    except ConfigEntryError:
+        if new_api:
+            new_api.async_shutdown()
+        raise
 
-        try:
-            await udp_listener.start()
-        except Exception:
-            raise ConfigEntryError("Failed to start udp listener.")  # noqa: B904
-    else:
-        udp_listener = domain_data[UDP_LISTENER]
+    if new_api:
+        # Registered only now, so a failed setup doesn't leave the client behind
+        domain_data[API_CLIENTS][api_key] = new_api
 
     coordinator = AtombergDataUpdateCoordinator(
-        hass=hass, api=api, udp_listener=udp_listener
+        hass=hass, api=api, udp_listener=udp_listener, udp_sender=udp_sender
     )
     domain_data[ENTRIES][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, CLOUD_PLATFORMS)
 
+    if sync_in_background:
+        entry.async_create_background_task(
+            hass, coordinator.async_sync_from_cloud(), "atomberg_cloud_sync"
+        )
+
     return True
 
 
+async def _async_start_udp(
+    hass: HomeAssistant, domain_data: dict[str, Any]
+) -> tuple[UDPListener, UDPSender]:
+    """Start the UDP listener and sender shared by all entries."""
+    if not (udp_listener := domain_data[UDP_LISTENER]):
+        udp_listener = UDPListener(hass)
+        try:
+            await udp_listener.start()
+        except Exception:
+            raise ConfigEntryError("Failed to start udp listener.")  # noqa: B904
+        domain_data[UDP_LISTENER] = udp_listener
+
+    if not (udp_sender := domain_data[UDP_SENDER]):
+        udp_sender = UDPSender()
+        try:
+            await udp_sender.start()
+        except Exception:
+            raise ConfigEntryError("Failed to open udp transport.")  # noqa: B904
+        domain_data[UDP_SENDER] = udp_sender
+
+    return udp_listener, udp_sender
+
+
 async def _async_setup_ir_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Atomberg using IR control."""
     await hass.config_entries.async_forward_entry_setups(entry, IR_PLATFORMS)
@@ -97,12 +157,25 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if not unload_ok:
         return False
 
-    domain_data[ENTRIES].pop(entry.entry_id, None)
+    coordinator: AtombergDataUpdateCoordinator = domain_data[ENTRIES].pop(
+        entry.entry_id
+    )
+    api = coordinator.api
+    last_entry_of_api = not any(c.api is api for c in domain_data[ENTRIES].values())
+    if last_entry_of_api:
+        domain_data[API_CLIENTS].pop(entry.data[CONF_API_KEY], None)
+        api.async_shutdown()
 
     udp_listener.remove_callback(entry)
 
     if not domain_data[ENTRIES]:
         udp_listener.close()
         domain_data[UDP_LISTENER] = None
+        domain_data[UDP_SENDER].close()
+        domain_data[UDP_SENDER] = None
+
+    if last_entry_of_api and api.device_list:
+        # Written before a reload sets up a new client reading it
+        await api.async_save_snapshot()
 
     return unload_ok
@@ -1,21 +1,29 @@
 """Cloud API for Atomberg."""
 
-import datetime
-import functools
-from copy import deepcopy
+import asyncio
+import random
+import time
+from collections.abc import Container
+from http import HTTPStatus
 from logging import getLogger
-from typing import Literal
+from typing import Any, Literal
 
-import jwt
-import requests
-from homeassistant.core import HomeAssistant
+import aiohttp
+from aiohttp import hdrs
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.util.dt import utcnow
-from requests import Response
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.json import json_loads
+
+from .auth import AccessTokenManager
+from .circuit_breaker import CircuitBreaker, CircuitState
+from .metrics import CloudMetrics
+from .rate_limit import RequestPriority, RequestScheduler, parse_retry_after
+from .storage import account_store
 
 _LOGGER = getLogger(__name__)
 
-SUPPORTED_SERIES = [
+SUPPORTED_SERIES = {
     "R1",
     "R2",
     "R3",
@@ -29,21 +37,92 @@ SUPPORTED_SERIES = [
     "M2",
     "S1",
     "S2",
-]
+}
+
+ENDPOINT_GET_ACCESS_TOKEN = "/v1/get_access_token"
+ENDPOINT_GET_LIST_OF_DEVICES = "/v1/get_list_of_devices"
+ENDPOINT_GET_DEVICE_STATE = "/v1/get_device_state"
+ENDPOINT_SEND_COMMAND = "/v1/send_command"
+CLOUD_ENDPOINTS = (
+    ENDPOINT_GET_ACCESS_TOKEN,
+    ENDPOINT_GET_LIST_OF_DEVICES,
+    ENDPOINT_GET_DEVICE_STATE,
+    ENDPOINT_SEND_COMMAND,
+)
+
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+MAX_RATE_LIMIT_RETRIES = 2
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.5  # Seconds
+DEFAULT_BACKOFF_MAX = 8.0  # Seconds
+SNAPSHOT_SAVE_DELAY = 10  # Seconds
+
+# Normalised state attributes, others like ts_epoch_seconds are dropped so that
+# device states stay fully packed
+DEVICE_STATE_KEYS = frozenset(
+    {
+        "is_online",
+        "power",
+        "led",
+        "sleep",
+        "speed",
+        "timer_hours",
+        "timer_time_elapsed_mins",
+        "brightness",
+        "light_mode",
+    }
+)
 
 
 class AtombergCloudAPI:
     """Atomberg CloudAPI."""
 
-    def __init__(self, hass: HomeAssistant, api_key: str, refresh_token: str) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api_key: str,
+        refresh_token: str,
+        *,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+    ) -> None:
         """Init Atomberg CloudAPI."""
         self._hass = hass
+        self._session = async_get_clientsession(hass)
         self._base_url = "https://api.developer.atomberg-iot.com"
         self._api_key = api_key
         self._refresh_token = refresh_token
-        self._access_token = None
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._scheduler = RequestScheduler()
+        self._breaker = CircuitBreaker()
+        self.metrics = CloudMetrics()
+        self._token_manager = AccessTokenManager(
+            hass, api_key, self._async_fetch_access_token
+        )
+        self._snapshot_store = account_store(hass, api_key, "devices")
         self.device_list: dict[str, dict] = {}
 
+    @property
+    def available(self) -> bool:
+        """Whether a cloud call may be attempted now.
+
+        A half-open breaker counts as available, so that a user command can be
+        the trial call which closes it again.
+        """
+        return self._breaker.can_attempt
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Get health and request metrics of the client."""
+        return {
+            "circuit_breaker": self._breaker.state,
+            "rate_limit_tokens": round(self._scheduler.tokens, 2),
+            "endpoints": self.metrics.as_dict(),
+        }
+
     async def test_connection(self):
         """Test API connection."""
         try:
@@ -55,44 +134,66 @@ class AtombergCloudAPI:
             _LOGGER.error("Atomberg Cloud connection test failed")
             raise CannotConnect("Failed to connect") from e
 
-    async def async_get_access_token(self):
+    async def async_get_access_token(self) -> str | None:
         """Get access token."""
+        return await self._token_manager.async_get_token()
 
-        async def get_access_token():
-            try:
-                resp = await self.async_make_request(
-                    "/v1/get_access_token",
-                    headers={"Authorization": f"Bearer {self._refresh_token}"},
-                )
-            except requests.exceptions.ConnectionError:
-                return ConnectionError
+    async def _async_fetch_access_token(self) -> str | None:
+        """Fetch a new access token using the refresh token."""
+        try:
+            data = await self.async_make_request(
+                ENDPOINT_GET_ACCESS_TOKEN,
+                headers={"Authorization": f"Bearer {self._refresh_token}"},
+            )
+        except CannotConnect:
+            _LOGGER.error("Failed to fetch access token")
+            return None
 
-            if not resp.ok:
-                return
+        if data.get("status") == "Success":
+            return data["message"]["access_token"]
+        return None
 
-            data = resp.json()
-            if data["status"] == "Success":
-                self._access_token = resp.json()["message"]["access_token"]
-                return self._access_token
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel background work of the client."""
+        self._token_manager.async_shutdown()
 
-        access_token_expired = False
-        if self._access_token:
-            try:
-                access_token_data = jwt.decode(
-                    self._access_token, options={"verify_signature": False}
-                )
-                exp_timestamp = access_token_data["exp"]
-                exp_datetime = datetime.datetime.fromtimestamp(
-                    exp_timestamp, datetime.UTC
-                )
-                access_token_expired = utcnow() > exp_datetime
-            except jwt.ExpiredSignatureError:
-                access_token_expired = True
+    async def async_load_snapshot(self) -> bool:
+        """Load the last known device list and states from storage."""
+        if not (data := await self._snapshot_store.async_load()):
+            return False
+
+        for device_id, dev in data.get("devices", {}).items():
+            # Snapshots of older versions may hold cloud-only keys
+            dev["state"] = {
+                k: v for k, v in dev["state"].items() if k in DEVICE_STATE_KEYS
+            }
+            # Presence is only known from fresh udp broadcasts
+            dev["state"]["is_online"] = False
+            self.device_list[device_id] = dev
+        _LOGGER.info("Loaded %d atomberg devices from storage", len(self.device_list))
+        return bool(self.device_list)
+
+    async def async_save_snapshot(self) -> None:
+        """Persist device list and states right away.
 
-            if not access_token_expired:
-                return self._access_token
+        Replaces a pending delayed save, so that a client created next, e.g.
+        by a reload, loads the current snapshot.
+        """
+        await self._snapshot_store.async_save(self._snapshot_data())
 
-        return await get_access_token()
+    @callback
+    def _async_save_snapshot(self) -> None:
+        """Persist device list and states."""
+        self._snapshot_store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+    def _snapshot_data(self) -> dict[str, Any]:
+        return {
+            "devices": {
+                device_id: {**dev, "state": dict(dev["state"])}
+                for device_id, dev in self.device_list.items()
+            }
+        }
 
     async def async_make_request(
         self,
@@ -100,60 +201,186 @@ class AtombergCloudAPI:
         method: Literal["GET", "POST"] = "GET",
         body: dict | None = None,
         headers: dict | None = None,
-    ) -> Response:
-        """Make a request."""
+        priority: RequestPriority = RequestPriority.USER,
+    ) -> dict[str, Any]:
+        """Make a request and return the decoded JSON body."""
         headers_base = {
             "X-API-Key": self._api_key,
         }
-        headers_extra = (
-            headers
-            if headers
-            else {"Authorization": f"Bearer {await self.async_get_access_token()}"}
-        )
+        token = None
+        if not headers and not (token := await self.async_get_access_token()):
+            # A request without a token would only be rejected
+            raise CannotConnect("Could not get an access token")
         full_url = self._base_url + url
+        endpoint = url.split("?", 1)[0]
+
+        # The breaker is asked once per call, retries belong to the same call
+        if not self._breaker.allow_request():
+            # Rejected calls have no latency, they'd drag percentiles to 0
+            self.metrics.record(endpoint, None, "circuit_open")
+            raise CircuitOpen("Atomberg Cloud API is unavailable")
+        trial = not self._breaker.is_closed
+        try:
+            try:
+                return await self._async_request_with_retries(
+                    method,
+                    full_url,
+                    endpoint,
+                    dict(
+                        headers_base,
+                        **(headers or {"Authorization": f"Bearer {token}"}),
+                    ),
+                    body=body,
+                    priority=priority,
+                    reject_unauthorized=not headers,
+                )
+            except TokenRejected:
+                # Token was revoked or replaced, retry once with a fresh one
+                _LOGGER.info("Access token was rejected, refreshing it")
+                if not (
+                    token := await self._token_manager.async_replace_rejected(token)
+                ):
+                    raise CannotConnect(
+                        "Could not refresh rejected access token"
+                    ) from None
+                return await self._async_request_with_retries(
+                    method,
+                    full_url,
+                    endpoint,
+                    dict(headers_base, Authorization=f"Bearer {token}"),
+                    body=body,
+                    priority=priority,
+                )
+        finally:
+            if trial:
+                # Never leave a half-open breaker waiting for an outcome
+                self._breaker.end_trial()
 
-        match method:
-            case "POST":
-                func = functools.partial(
-                    requests.post,
+    async def _async_request_with_retries(
+        self,
+        method: str,
+        full_url: str,
+        endpoint: str,
+        headers: dict[str, str],
+        *,
+        body: dict | None,
+        priority: RequestPriority,
+        reject_unauthorized: bool = False,
+    ) -> dict[str, Any]:
+        """Make a request, retrying rate limited and failed idempotent calls."""
+        # Only idempotent calls are retried on transport or server errors
+        max_retries = self._max_retries if method == "GET" else 0
+        retries = rate_limit_retries = 0
+        while True:
+            await self._scheduler.async_acquire(priority)
+            started = time.monotonic()
+            try:
+                async with self._session.request(
+                    method,
                     full_url,
-                    headers=dict(headers_base, **headers_extra),
+                    headers=headers,
                     json=body,
+                    timeout=REQUEST_TIMEOUT,
+                ) as resp:
+                    if (
+                        resp.status == HTTPStatus.TOO_MANY_REQUESTS
+                        and rate_limit_retries < MAX_RATE_LIMIT_RETRIES
+                    ):
+                        rate_limit_retries += 1
+                        self.metrics.record(
+                            endpoint, time.monotonic() - started, str(resp.status)
+                        )
+                        # Rate limited means the API is reachable
+                        self._breaker.record_success()
+                        self._scheduler.block_for(
+                            parse_retry_after(resp.headers.get(hdrs.RETRY_AFTER))
+                        )
+                        continue
+
+                    if resp.status == HTTPStatus.UNAUTHORIZED and reject_unauthorized:
+                        self.metrics.record(
+                            endpoint, time.monotonic() - started, str(resp.status)
+                        )
+                        self._breaker.record_success()
+                        raise TokenRejected
+
+                    if resp.status >= 500:
+                        raise aiohttp.ClientResponseError(
+                            resp.request_info, resp.history, status=resp.status
+                        )
+
+                    data = await self._async_decode_body(resp)
+            except (aiohttp.ClientError, TimeoutError) as e:
+                self.metrics.record(
+                    endpoint,
+                    time.monotonic() - started,
+                    str(e.status)
+                    if isinstance(e, aiohttp.ClientResponseError)
+                    else type(e).__name__,
+                )
+                self._breaker.record_failure()
+                if retries >= max_retries or self._breaker.state == CircuitState.OPEN:
+                    raise CannotConnect(f"Request to {full_url} failed: {e!r}") from e
+                delay = random.uniform(
+                    0, min(self._backoff_max, self._backoff_base * 2**retries)
                 )
-            case _:
-                func = functools.partial(
-                    requests.get, full_url, headers=dict(headers_base, **headers_extra)
+                retries += 1
+                _LOGGER.debug(
+                    "Request to %s failed (%r), retrying in %.2fs", full_url, e, delay
                 )
+                await asyncio.sleep(delay)
+                continue
 
-        resp = await self._hass.async_add_executor_job(func)
-        if not resp.ok and resp.status_code < 500:
-            error_msg = resp.json()["message"]
-            _LOGGER.error("Request failed due to %s", error_msg)
-        return resp
+            self.metrics.record(
+                endpoint,
+                time.monotonic() - started,
+                None if resp.ok else str(resp.status),
+            )
+            self._breaker.record_success()
+            if not resp.ok:
+                _LOGGER.error("Request failed due to %s", data.get("message"))
+            return data
+
+    @staticmethod
+    async def _async_decode_body(resp: aiohttp.ClientResponse) -> dict[str, Any]:
+        """Decode JSON body, tolerating non-JSON error bodies."""
+        raw = await resp.read()
+        try:
+            data = json_loads(raw)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            return data
+        return {"status": "Failed", "message": raw.decode(errors="replace")}
 
     async def async_sync_list_of_devices(self) -> bool:
         """Get list of all devices connected to the account."""
-        resp = await self.async_make_request("/v1/get_list_of_devices")
+        data = await self.async_make_request(
+            ENDPOINT_GET_LIST_OF_DEVICES, priority=RequestPriority.BACKGROUND
+        )
 
-        data = resp.json()
         status = False
         if data.get("status") == "Success":
-            supported_devices = list(
-                filter(
-                    lambda d: d["series"] in SUPPORTED_SERIES,
-                    data["message"]["devices_list"],
-                )
-            )
-            states = await self.async_get_device_state(
-                [d["device_id"] for d in supported_devices]
-            )
-            for dev in supported_devices:
-                state = next(
-                    filter(lambda x: x["device_id"] == dev["device_id"], states)
-                )
-                states.remove(state)
-                self.device_list[state.pop("device_id")] = {**dev, "state": state}
+            supported_devices = {
+                d["device_id"]: d
+                for d in data["message"]["devices_list"]
+                if d["series"] in SUPPORTED_SERIES
+            }
+            states = await self.async_get_device_state(supported_devices)
+            for device_id in self.device_list.keys() - supported_devices.keys():
+                del self.device_list[device_id]
+            for device_id, dev in supported_devices.items():
+                if (state := states.get(device_id)) is None:
+                    _LOGGER.warning("No state received for device %s", device_id)
+                    continue
+                if existing := self.device_list.get(device_id):
+                    # Devices may already be running off this entry, keep presence
+                    state.pop("is_online")
+                    existing.update({**dev, "state": {**existing["state"], **state}})
+                else:
+                    self.device_list[device_id] = {**dev, "state": state}
             _LOGGER.info("Found %d atomberg devices", len(self.device_list))
+            self._async_save_snapshot()
             status = True
         else:  # noqa: RET505
             _LOGGER.error(
@@ -163,28 +390,25 @@ class AtombergCloudAPI:
         return status
 
     async def async_get_device_state(
-        self, device_ids: list[str] | None = None
-    ) -> list[dict] | None:
-        """Get state of all/single device(s)."""
-        resp = await self.async_make_request("/v1/get_device_state?device_id=all")
+        self,
+        device_ids: Container[str] | None = None,
+        keep_cloud_presence: bool = False,
+    ) -> dict[str, dict] | None:
+        """Get state of all/single device(s), keyed by device_id."""
+        data = await self.async_make_request(
+            f"{ENDPOINT_GET_DEVICE_STATE}?device_id=all",
+            priority=RequestPriority.BACKGROUND,
+        )
 
-        data = resp.json()
         if data["status"] == "Success":
-            device_state = []
-            for state in filter(
-                lambda s: s["device_id"] in device_ids if device_ids else True,
-                deepcopy(data["message"]["device_state"]),
-            ):
-                # Keep is_online=False unless it's presense detected through udp broadcasts
-                state["is_online"] = False
-                # Rename some keys for ease of access
-                state["speed"] = state.pop("last_recorded_speed")
-                state["sleep"] = state.pop("sleep_mode")
-                if state.get("last_recorded_brightness"):
-                    state["brightness"] = state.pop("last_recorded_brightness")
-                if state.get("last_recorded_color"):
-                    state["light_mode"] = state.pop("last_recorded_color")
-                device_state.append(state)
+            device_state = {}
+            # The decoded body is owned by us, so states are normalised in place
+            for state in data["message"]["device_state"]:
+                device_id = state.pop("device_id")
+                if device_ids is not None and device_id not in device_ids:
+                    continue
+                normalize_device_state(state, keep_cloud_presence)
+                device_state[device_id] = state
 
             return device_state
 
@@ -192,9 +416,34 @@ class AtombergCloudAPI:
         """Send command to a device."""
         _LOGGER.debug("Sending command: '%s' to %s", command, device_id)
         payload = {"device_id": device_id, "command": command}
-        resp = await self.async_make_request("/v1/send_command", "POST", body=payload)
-        data = resp.json()
-        return data["status"] == "Success"
+        data = await self.async_make_request(
+            ENDPOINT_SEND_COMMAND, "POST", body=payload
+        )
+        if data.get("status") != "Success":
+            _LOGGER.warning(
+                "Command '%s' to %s was rejected: %s",
+                command,
+                device_id,
+                data.get("message"),
+            )
+            return False
+        return True
+
+
+def normalize_device_state(
+    state: dict[str, Any], keep_cloud_presence: bool = False
+) -> None:
+    """Rename keys of a cloud device state in place for ease of access."""
+    # Keep is_online=False unless it's presense detected through udp broadcasts
+    state["is_online"] = keep_cloud_presence and bool(state.get("is_online"))
+    state["speed"] = state.pop("last_recorded_speed")
+    state["sleep"] = state.pop("sleep_mode")
+    if state.get("last_recorded_brightness"):
+        state["brightness"] = state.pop("last_recorded_brightness")
+    if state.get("last_recorded_color"):
+        state["light_mode"] = state.pop("last_recorded_color")
+    for key in state.keys() - DEVICE_STATE_KEYS:
+        del state[key]
 
 
 class CannotConnect(HomeAssistantError):
@@ -203,3 +452,11 @@ class CannotConnect(HomeAssistantError):
 
 class InvalidAuth(HomeAssistantError):
     """Error to indicate there is invalid auth."""
+
+
+class CircuitOpen(CannotConnect):
+    """Error to indicate cloud calls are paused after repeated failures."""
+
+
+class TokenRejected(Exception):
+    """Error to indicate the access token was rejected by the API."""
@@ -0,0 +1,139 @@
+"""Access token management for Atomberg Cloud API."""
+
+import asyncio
+import datetime as dt
+from collections.abc import Awaitable, Callable
+from logging import getLogger
+
+import jwt
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.util.dt import utcnow
+
+from .storage import account_store
+
+_LOGGER = getLogger(__name__)
+
+# Treat the token as expired slightly early to absorb clock skew
+EXPIRY_LEEWAY = dt.timedelta(seconds=30)
+# Refresh the token in background this long before it expires
+PROACTIVE_REFRESH_BEFORE = dt.timedelta(minutes=5)
+
+
+class AccessTokenManager:
+    """Cache, persist and refresh the access token of an account."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api_key: str,
+        fetch_token: Callable[[], Awaitable[str | None]],
+    ) -> None:
+        """Init access token manager."""
+        self._hass = hass
+        self._fetch_token = fetch_token
+        self._store: Store[dict] = account_store(hass, api_key, "token", private=True)
+        self._lock = asyncio.Lock()
+        self._loaded = False
+        self._access_token: str | None = None
+        self._expires_at: dt.datetime | None = None
+        self._cancel_refresh: CALLBACK_TYPE | None = None
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether the cached token can still be used."""
+        return bool(
+            self._access_token
+            and self._expires_at
+            and utcnow() < self._expires_at - EXPIRY_LEEWAY
+        )
+
+    async def async_get_token(self) -> str | None:
+        """Get a valid access token, refreshing it if required."""
+        if self._loaded and self.is_valid:
+            return self._access_token
+
+        # Concurrent callers queue up here and reuse the refreshed token
+        async with self._lock:
+            if not self._loaded:
+                await self._async_load()
+            if self.is_valid:
+                return self._access_token
+            return await self._async_refresh()
+
+    async def async_refresh(self) -> str | None:
+        """Force refresh of the access token."""
+        async with self._lock:
+            return await self._async_refresh()
+
+    async def async_replace_rejected(self, rejected: str | None) -> str | None:
+        """Replace a token rejected by the API, also in the store."""
+        async with self._lock:
+            if self._access_token != rejected and self.is_valid:
+                # Another caller already replaced it
+                return self._access_token
+            self._access_token = self._expires_at = None
+            self.async_shutdown()
+            if (token := await self._async_refresh()) is None:
+                # Don't load the rejected token again after a restart
+                await self._store.async_remove()
+            return token
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel scheduled refresh."""
+        if self._cancel_refresh:
+            self._cancel_refresh()
+            self._cancel_refresh = None
+
+    async def _async_load(self) -> None:
+        """Load persisted token."""
+        self._loaded = True
+        if not (data := await self._store.async_load()):
+            return
+        if self._set_token(data.get("access_token")):
+            _LOGGER.debug("Loaded persisted access token")
+            self._schedule_refresh()
+
+    async def _async_refresh(self) -> str | None:
+        """Fetch a new token. Must be called with the lock held."""
+        _LOGGER.debug("Refreshing access token")
+        if not self._set_token(await self._fetch_token()):
+            return None
+
+        self._store.async_delay_save(
+            lambda: {"access_token": self._access_token}, delay=1
+        )
+        self._schedule_refresh()
+        return self._access_token
+
+    def _set_token(self, access_token: str | None) -> bool:
+        """Parse expiry and cache the token."""
+        if not access_token:
+            return False
+        try:
+            exp_timestamp = jwt.decode(
+                access_token, options={"verify_signature": False}
+            )["exp"]
+        except (jwt.PyJWTError, KeyError):
+            _LOGGER.warning("Received access token with invalid expiry")
+            return False
+
+        self._access_token = access_token
+        self._expires_at = dt.datetime.fromtimestamp(exp_timestamp, dt.UTC)
+        return True
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule proactive refresh before the token expires."""
+        self.async_shutdown()
+        delay = (self._expires_at - PROACTIVE_REFRESH_BEFORE - utcnow()).total_seconds()
+        self._cancel_refresh = async_call_later(
+            self._hass, max(delay, 0), self._async_scheduled_refresh
+        )
+
+    async def _async_scheduled_refresh(self, _now: dt.datetime) -> None:
+        """Refresh token in background."""
+        self._cancel_refresh = None
+        await self.async_refresh()
@@ -0,0 +1,66 @@
+"""Learned broadcast cadence of Atomberg devices."""
+
+import math
+from collections import deque
+from typing import Any
+
+CADENCE_SAMPLES = 64
+CADENCE_MIN_SAMPLES = 8
+CADENCE_PERCENTILE = 99
+# Offline timeout is the percentile of inter-arrival times scaled by the factor
+CADENCE_TIMEOUT_FACTOR = 1.5
+CADENCE_TIMEOUT_MAX = 120  # Seconds
+# Learned timeout is only applied when it moves by more than this fraction
+CADENCE_HYSTERESIS = 0.25
+
+
+class BroadcastCadence:
+    """Inter-arrival times of the broadcasts of a device.
+
+    The offline timeout follows a high percentile of recent inter-arrival
+    times, but never drops below `default_timeout`.
+    """
+
+    def __init__(self, default_timeout: float) -> None:
+        """Init broadcast cadence."""
+        self._default_timeout = default_timeout
+        self._intervals: deque[float] = deque(maxlen=CADENCE_SAMPLES)
+        self.timeout = default_timeout
+
+    def record(self, interval: float) -> None:
+        """Record time between two broadcasts."""
+        if not 0 < interval <= CADENCE_TIMEOUT_MAX:
+            # Device was switched off or the clock jumped
+            return
+        self._intervals.append(interval)
+        if len(self._intervals) < CADENCE_MIN_SAMPLES:
+            return
+
+        learned = min(
+            max(
+                self.percentile(CADENCE_PERCENTILE) * CADENCE_TIMEOUT_FACTOR,
+                self._default_timeout,
+            ),
+            CADENCE_TIMEOUT_MAX,
+        )
+        if abs(learned - self.timeout) > self.timeout * CADENCE_HYSTERESIS:
+            self.timeout = learned
+
+    def percentile(self, percent: float) -> float | None:
+        """Get percentile of recorded inter-arrival times in seconds."""
+        if not self._intervals:
+            return None
+        intervals = sorted(self._intervals)
+        return intervals[max(math.ceil(len(intervals) * percent / 100) - 1, 0)]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get cadence as a dict."""
+        return {
+            "samples": len(self._intervals),
+            "interval_s": {
+                "p50": self.percentile(50),
+                "p95": self.percentile(95),
+                "p99": self.percentile(99),
+            },
+            "offline_timeout_s": self.timeout,
+        }
@@ -0,0 +1,104 @@
+"""Circuit breaker for Atomberg Cloud API."""
+
+import time
+from enum import StrEnum
+from logging import getLogger
+
+_LOGGER = getLogger(__name__)
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0  # Seconds
+
+
+class CircuitState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast while the cloud API keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    are rejected. Once `reset_timeout` has passed a single trial call is let
+    through, which closes the circuit again on success.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+    ) -> None:
+        """Init circuit breaker."""
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._state = CircuitState.CLOSED
+
+    @property
+    def state(self) -> CircuitState:
+        """Get current state."""
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self._reset_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._trial_running = False
+        return self._state
+
+    @property
+    def is_closed(self) -> bool:
+        """Whether calls go through normally."""
+        return self.state == CircuitState.CLOSED
+
+    @property
+    def can_attempt(self) -> bool:
+        """Whether a call would be let through now, without claiming a trial."""
+        match self.state:
+            case CircuitState.CLOSED:
+                return True
+            case CircuitState.HALF_OPEN:
+                return not self._trial_running
+        return False
+
+    def allow_request(self) -> bool:
+        """Check whether a call may be made now."""
+        match self.state:
+            case CircuitState.CLOSED:
+                return True
+            case CircuitState.HALF_OPEN if not self._trial_running:
+                self._trial_running = True
+                return True
+        return False
+
+    def end_trial(self) -> None:
+        """End a trial call which recorded no outcome, e.g. when cancelled."""
+        self._trial_running = False
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        if self._state != CircuitState.CLOSED:
+            _LOGGER.info("Atomberg Cloud API recovered")
+        self._failures = 0
+        self._trial_running = False
+        self._state = CircuitState.CLOSED
+
+    def record_failure(self) -> None:
+        """Record a failed call."""
+        self._failures += 1
+        self._trial_running = False
+        if (
+            self._state == CircuitState.HALF_OPEN
+            or self._failures >= self._failure_threshold
+        ):
+            if self._state != CircuitState.OPEN:
+                _LOGGER.warning(
+                    "Atomberg Cloud API is failing, pausing cloud calls for %.0fs",
+                    self._reset_timeout,
+                )
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
@@ -0,0 +1,96 @@
+"""Command coalescing for Atomberg devices."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from logging import getLogger
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = getLogger(__name__)
+
+DEFAULT_WINDOW = 0.3  # Seconds
+
+
+class CommandCoalescer:
+    """Merge commands sent within a short window into a single command.
+
+    Later values of an attribute replace earlier ones, so only the final
+    value of e.g. a dragged slider reaches the device.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        send: Callable[[dict[str, Any]], Awaitable[bool]],
+        window: float = DEFAULT_WINDOW,
+    ) -> None:
+        """Init command coalescer."""
+        self._hass = hass
+        self._send = send
+        self._window = window
+        self._pending: dict[str, Any] = {}
+        self._future: asyncio.Future[bool] | None = None
+        self._cancel_timer: CALLBACK_TYPE | None = None
+        self._task: asyncio.Task | None = None
+
+    async def async_send(self, command: dict[str, Any]) -> bool:
+        """Queue command and wait for the merged command to be sent."""
+        self._pending.update(command)
+        if self._future is None:
+            self._future = self._hass.loop.create_future()
+            self._cancel_timer = async_call_later(self._hass, self._window, self._flush)
+
+        # Shield so that a cancelled caller doesn't cancel the merged command
+        return await asyncio.shield(self._future)
+
+    async def async_flush(self) -> None:
+        """Send pending command right away."""
+        if self._future is not None:
+            await self._async_send_pending()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Drop pending command and cancel its timer and send."""
+        self._cancel_pending_timer()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        if self._future is not None and not self._future.done():
+            self._future.cancel()
+        self._pending, self._future = {}, None
+
+    @callback
+    def _flush(self, _now: datetime) -> None:
+        """Send pending command when the window closes."""
+        self._cancel_timer = None
+        self._task = self._hass.async_create_task(
+            self._async_send_pending(), "atomberg_coalesced_command"
+        )
+
+    @callback
+    def _cancel_pending_timer(self) -> None:
+        if self._cancel_timer:
+            self._cancel_timer()
+            self._cancel_timer = None
+
+    async def _async_send_pending(self) -> None:
+        self._cancel_pending_timer()
+
+        command, future = self._pending, self._future
+        self._pending, self._future = {}, None
+        if future is None:
+            return
+
+        _LOGGER.debug("Sending coalesced command: %s", command)
+        try:
+            result = await self._send(command)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:  # pylint: disable=broad-except
+            future.set_exception(e)
+        else:
+            future.set_result(result)
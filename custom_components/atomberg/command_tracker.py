@@ -0,0 +1,78 @@
+"""Confirmation of local commands for Atomberg devices."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from logging import getLogger
+from typing import Any
+
+from .metrics import EndpointMetrics
+
+_LOGGER = getLogger(__name__)
+
+DEFAULT_ATTEMPTS = 3
+DEFAULT_CONFIRM_TIMEOUT = 1.0  # Seconds, doubled on every retransmit
+
+
+class LocalCommandTracker:
+    """Wait for the broadcasts of a device to confirm commands sent over UDP.
+
+    A command which isn't confirmed within the timeout is sent again, up to
+    `attempts` times. A command is superseded, and no longer retransmitted,
+    when a later one changes the same attributes.
+    """
+
+    def __init__(
+        self,
+        attempts: int = DEFAULT_ATTEMPTS,
+        timeout: float = DEFAULT_CONFIRM_TIMEOUT,
+    ) -> None:
+        """Init local command tracker."""
+        self._attempts = attempts
+        self._timeout = timeout
+        self._pending: list[tuple[Mapping[str, Any], asyncio.Future[bool]]] = []
+        self.metrics = EndpointMetrics()
+
+    async def async_send(
+        self, send: Callable[[], Awaitable[bool]], expected: Mapping[str, Any]
+    ) -> bool:
+        """Send until the expected state is confirmed, return whether it was."""
+        if not expected:
+            return await send()
+
+        for other, future in self._pending:
+            if not future.done() and other.keys() & expected.keys():
+                future.set_result(False)
+
+        future = asyncio.get_running_loop().create_future()
+        item = (expected, future)
+        self._pending.append(item)
+        start = time.monotonic()
+        timeout = self._timeout
+        try:
+            for attempt in range(self._attempts):
+                if attempt:
+                    _LOGGER.debug("Retransmitting unconfirmed command: %s", expected)
+                if not await send():
+                    break
+                try:
+                    confirmed = await asyncio.wait_for(asyncio.shield(future), timeout)
+                except TimeoutError:
+                    timeout *= 2
+                    continue
+                if confirmed:
+                    self.metrics.record(time.monotonic() - start)
+                return True
+        finally:
+            self._pending.remove(item)
+
+        self.metrics.record(time.monotonic() - start, "unconfirmed")
+        return False
+
+    def confirm(self, state: Mapping[str, Any]) -> None:
+        """Confirm pending commands matching a broadcast state."""
+        for expected, future in self._pending:
+            if not future.done() and all(
+                state.get(attr) == value for attr, value in expected.items()
+            ):
+                future.set_result(True)
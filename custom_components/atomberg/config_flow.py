@@ -63,7 +63,10 @@ async def validate_cloud_input(
     refresh_token = data[CONF_REFRESH_TOKEN]
 
     api = AtombergCloudAPI(hass, api_key, refresh_token)
-    await api.test_connection()
+    try:
+        await api.test_connection()
+    finally:
+        api.async_shutdown()
 
     title = "Atomberg Integration"
     if hass.data.get(DOMAIN):
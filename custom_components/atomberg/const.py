@@ -5,7 +5,9 @@ from enum import StrEnum
 DOMAIN = "atomberg"
 
 UDP_LISTENER = "udp_listener"
+UDP_SENDER = "udp_sender"
 ENTRIES = "entries"
+API_CLIENTS = "api_clients"
 
 CONF_REFRESH_TOKEN = "refresh_token"
 CONF_USE_CLOUD_CONTROL = "use_cloud_control"
@@ -14,6 +16,8 @@ CONF_IR_EMITTER_ENTITY = "ir_emitter_entity"
 CONF_FAN_MODEL = "fan_model"
 MANUFACTURER = "Atomberg"
 
+AVAILABILITY_TIMEOUT = 10  # Seconds
+
 
 class ControlMethod(StrEnum):
     """Control method for Atomberg devices."""
@@ -1,33 +1,291 @@
 """Data update coordinator for the Atomberg integration."""
 
+import heapq
+from collections.abc import Callable
+from datetime import datetime, timedelta
 from logging import getLogger
+from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util.dt import utcnow
 
-from .api import AtombergCloudAPI
+from .api import AtombergCloudAPI, CannotConnect, InvalidAuth
 from .const import MANUFACTURER
-from .device import AtombergDevice
+from .device import ATTR_IS_ONLINE, ONLINE_STATE, AtombergDevice
 from .udp_listener import UDPListener
+from .udp_sender import UDPSender
 
 _LOGGER = getLogger(__name__)
 
+# Cloud polling of devices which are not heard on UDP
+POLL_INTERVAL_MIN = 30  # Seconds
+POLL_INTERVAL_MAX = 600  # Seconds
+
 
 class AtombergDataUpdateCoordinator(DataUpdateCoordinator):
     """Atomberg data update coordinator."""
 
     def __init__(
-        self, hass: HomeAssistant, api: AtombergCloudAPI, udp_listener: UDPListener
+        self,
+        hass: HomeAssistant,
+        api: AtombergCloudAPI,
+        udp_listener: UDPListener,
+        udp_sender: UDPSender,
     ) -> None:
         """Init data update coordinator."""
         super().__init__(hass, _LOGGER, name=f"{MANUFACTURER} Coordinator")
 
         self.api = api
         self.udp_listener = udp_listener
+        self.udp_sender = udp_sender
         self.devices = [
-            AtombergDevice(data=data, api=self.api, config_entry=self.config_entry)
+            AtombergDevice(
+                hass=hass,
+                data=data,
+                api=self.api,
+                sender=self.udp_sender,
+                options=self.config_entry.options,
+                on_update=self.async_update_device_listeners,
+            )
             for data in self.api.device_list.values()
         ]
+        self._poll_intervals: dict[str, float] = {}
+        self._next_polls: dict[str, float] = {}
+        self._polling = False
+        self._device_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._devices_by_id = {device.id: device for device in self.devices}
+        # Heap of (offline deadline, device_id), at most one entry per device
+        self._deadlines: list[tuple[float, str]] = []
+        self._scheduled: set[str] = set()
+        self._cancel_sweep: CALLBACK_TYPE | None = None
+        self._sweep_at = 0.0
+        self.config_entry.async_on_unload(self._async_cancel_sweep)
+        self.config_entry.async_on_unload(self._async_shutdown_devices)
+
+        # Add callback on udp listener, only for the devices of this coordinator
+        self.udp_listener.add_callback(
+            self.config_entry,
+            self.async_handle_message,
+            self.async_handle_repeated_message,
+            [device.id for device in self.devices],
+        )
+
+        # Single options update listener for all devices of the entry
+        self.config_entry.async_on_unload(
+            self.config_entry.add_update_listener(self._async_update_options)
+        )
+
+        # Poll devices silent on UDP
+        self.config_entry.async_on_unload(
+            async_track_time_interval(
+                hass,
+                self._async_poll_silent_devices,
+                timedelta(seconds=POLL_INTERVAL_MIN),
+            )
+        )
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, indexed by device_id passed as context."""
+        remove = super().async_add_listener(update_callback, context)
+        if context is None:
+            return remove
+
+        listeners = self._device_listeners.setdefault(context, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            remove()
+            listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_update_device_listeners(self, device_id: str) -> None:
+        """Notify only the listeners of a device."""
+        for update_callback in list(self._device_listeners.get(device_id, ())):
+            update_callback()
+
+    @callback
+    def async_handle_message(self, message: dict[str, Any]) -> None:
+        """Handle a message received from a device over UDP."""
+        device = self._devices_by_id[message["device_id"]]
+
+        # Decode once here, the entities of the device share the result
+        if state_string := message.get("state_string"):
+            if (decoded := device.decode_state_string(state_string)) is None:
+                return
+            device.update_broadcast_state(decoded)
+        else:
+            device.update_state(ONLINE_STATE)
+        device.update_ip_address(message.get("ip_address"))
+        device.update_last_seen(utcnow().timestamp())
+        self._async_schedule_offline(device)
+        self.async_update_device_listeners(device.id)
+
+    async def _async_update_options(
+        self, hass: HomeAssistant, config_entry: ConfigEntry
+    ) -> None:
+        """Push updated options to the devices."""
+        for device in self.devices:
+            device.update_options(config_entry.options)
+
+    @callback
+    def async_handle_repeated_message(self, device_id: str, ip_address: str) -> None:
+        """Handle a message identical to the last one of the device."""
+        device = self._devices_by_id[device_id]
+        # Checked before last seen clears the polled flag
+        replay = device.polled or not device.state[ATTR_IS_ONLINE]
+        device.update_ip_address(ip_address)
+        device.update_last_seen(utcnow().timestamp())
+        self._async_schedule_offline(device)
+        if replay:
+            # Device comes back online, its broadcast replaces polled values
+            device.replay_broadcast_state()
+            self.async_update_device_listeners(device_id)
+        else:
+            device.confirm_broadcast()
+
+    def _offline_deadline(self, device: AtombergDevice) -> float:
+        """Get timestamp at which a device is considered offline."""
+        return device.last_seen + device.offline_timeout
+
+    @callback
+    def _async_schedule_offline(self, device: AtombergDevice) -> None:
+        """Make sure the sweeper checks a device heard on UDP."""
+        if device.id in self._scheduled:
+            # The sweeper finds the newer last_seen when the old deadline passes
+            return
+        self._scheduled.add(device.id)
+        deadline = self._offline_deadline(device)
+        heapq.heappush(self._deadlines, (deadline, device.id))
+        if self._cancel_sweep is None or deadline < self._sweep_at:
+            self._async_schedule_sweep(deadline)
+
+    @callback
+    def _async_schedule_sweep(self, at: float) -> None:
+        """Run the sweeper at given timestamp."""
+        self._async_cancel_sweep()
+        self._sweep_at = at
+        self._cancel_sweep = async_call_later(
+            self.hass, max(at - utcnow().timestamp(), 0), self._async_sweep
+        )
+
+    @callback
+    def _async_shutdown_devices(self) -> None:
+        for device in self.devices:
+            device.async_shutdown()
+
+    @callback
+    def _async_cancel_sweep(self) -> None:
+        if self._cancel_sweep is not None:
+            self._cancel_sweep()
+            self._cancel_sweep = None
+
+    @callback
+    def _async_sweep(self, now: datetime) -> None:
+        """Mark devices offline whose deadline passed."""
+        self._cancel_sweep = None
+        timestamp = now.timestamp()
+        while self._deadlines and self._deadlines[0][0] <= timestamp:
+            _, device_id = heapq.heappop(self._deadlines)
+            device = self._devices_by_id[device_id]
+            if device.polled:
+                # Presence comes from cloud until the device is heard again
+                self._scheduled.discard(device_id)
+            elif (deadline := self._offline_deadline(device)) > timestamp:
+                heapq.heappush(self._deadlines, (deadline, device_id))
+            else:
+                self._scheduled.discard(device_id)
+                _LOGGER.debug("%s (%s) went offline", device.name, device_id)
+                if device.update_state({ATTR_IS_ONLINE: False}):
+                    self.async_update_device_listeners(device_id)
+
+        if self._deadlines:
+            self._async_schedule_sweep(self._deadlines[0][0])
+
+    def _due_for_poll(self, device: AtombergDevice, now: float) -> bool:
+        """Check whether a device should be polled from cloud."""
+        if device.last_seen and now - device.last_seen <= device.offline_timeout:
+            # Broadcasts resumed, start over with the shortest interval next time
+            self._poll_intervals.pop(device.id, None)
+            self._next_polls.pop(device.id, None)
+            return False
+        return now >= self._next_polls.get(device.id, 0)
+
+    async def _async_poll_silent_devices(self, now: datetime) -> None:
+        """Poll state of devices not heard on UDP, backing off while they stay quiet."""
+        if self._polling:
+            # A slow or rate limited poll is still retrying
+            _LOGGER.debug("Previous poll still running, skipping")
+            return
+        self._polling = True
+        try:
+            await self._async_poll_due_devices(now)
+        finally:
+            self._polling = False
+
+    async def _async_poll_due_devices(self, now: datetime) -> None:
+        timestamp = now.timestamp()
+        due = {d.id: d for d in self.devices if self._due_for_poll(d, timestamp)}
+        if not due:
+            return
+
+        _LOGGER.debug("Polling state of %d silent device(s)", len(due))
+        try:
+            states = await self.api.async_get_device_state(
+                due, keep_cloud_presence=True
+            )
+        except (CannotConnect, KeyError) as e:
+            _LOGGER.debug("Polling device state failed: %s", e)
+            return
+
+        changed = set()
+        for device_id, device in due.items():
+            interval = self._poll_intervals.get(device_id, POLL_INTERVAL_MIN)
+            state = (states or {}).get(device_id)
+            if state is not None and device.update_polled_state(state):
+                # Someone is using the device, keep polling it often
+                interval = POLL_INTERVAL_MIN
+                changed.add(device_id)
+
+            self._next_polls[device_id] = timestamp + interval
+            self._poll_intervals[device_id] = min(interval * 2, POLL_INTERVAL_MAX)
+
+        if changed:
+            self._async_update_polled_devices(changed)
+
+    @callback
+    def _async_update_polled_devices(self, device_ids: set[str]) -> None:
+        """Notify listeners of devices whose state was applied from cloud."""
+        for device_id in device_ids:
+            self.async_update_device_listeners(device_id)
+
+    async def async_sync_from_cloud(self) -> None:
+        """Reconcile devices created from the stored snapshot with the cloud."""
+        try:
+            await self.api.test_connection()
+        except (CannotConnect, InvalidAuth) as e:
+            _LOGGER.warning("Atomberg Cloud sync failed, using stored devices: %s", e)
+            return
+
+        if {d.id for d in self.devices} != self.api.device_list.keys():
+            _LOGGER.info("Atomberg devices changed on cloud, reloading entry")
+            # The reloaded entry must start from the synced snapshot
+            await self.api.async_save_snapshot()
+            self.hass.config_entries.async_schedule_reload(self.config_entry.entry_id)
+            return
 
-        # Add callback on udp listener
-        self.udp_listener.add_callback(self.config_entry, self.async_set_updated_data)
+        self._async_update_polled_devices(
+            {
+                device.id
+                for device in self.devices
+                if device.update_state(self.api.device_list[device.id]["state"])
+            }
+        )
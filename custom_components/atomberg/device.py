@@ -1,18 +1,27 @@
 """Device as wrapper for Atomberg Cloud APIs."""
 
+import asyncio
 import json
-import socket
-from copy import deepcopy
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from datetime import datetime
+from functools import partial
 from logging import getLogger
 from typing import Any
 
 from homeassistant.components.light import ATTR_BRIGHTNESS
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.device_registry import format_mac
+from homeassistant.helpers.event import async_call_later
 
-from .api import AtombergCloudAPI
-from .const import CONF_USE_CLOUD_CONTROL
+from .api import AtombergCloudAPI, CannotConnect
+from .cadence import BroadcastCadence
+from .coalescer import CommandCoalescer
+from .command_tracker import LocalCommandTracker
+from .const import AVAILABILITY_TIMEOUT, CONF_USE_CLOUD_CONTROL
+from .metrics import EndpointMetrics
+from .path_selector import CommandPath, PathSelector
+from .udp_sender import UDPSender
 
 _LOGGER = getLogger(__name__)
 
@@ -25,6 +34,7 @@ ATTR_SPEED = "speed"
 ATTR_SLEEP = "sleep"
 ATTR_LIGHT_MODE = "light_mode"
 ATTR_LED = "led"
+ATTR_TIMER = "timer"
 ATTR_TIMER_HOURS = "timer_hours"
 ATTR_TIMER_TIME_ELAPSED_MINS = "timer_time_elapsed_mins"
 LIGHT_MODE_DAYLIGHT = "daylight"
@@ -40,14 +50,258 @@ TIMER_MAPPING = [
 ]
 
 
+LIGHT_MODES = (LIGHT_MODE_DAYLIGHT, LIGHT_MODE_COOL, LIGHT_MODE_WARM)
+
+# Seconds an unconfirmed command is shown before it is reconciled
+OPTIMISTIC_TIMEOUT = 10
+
+# Devices commanded over cloud at the same time by a group command
+GROUP_CLOUD_CONCURRENCY = 4
+
+# Attributes which are sent together as a single command
+COMMAND_GROUPS = (
+    (ATTR_POWER, ATTR_SPEED, ATTR_SLEEP, ATTR_TIMER),
+    (ATTR_LED, ATTR_BRIGHTNESS, ATTR_LIGHT_MODE),
+)
+
+# Packed layout of DeviceState: attribute -> (index, shift, width)
+_FIELDS: dict[str, tuple[int, int, int]] = {
+    ATTR_IS_ONLINE: (0, 0, 1),
+    ATTR_POWER: (1, 1, 1),
+    ATTR_LED: (2, 2, 1),
+    ATTR_SLEEP: (3, 3, 1),
+    ATTR_SPEED: (4, 4, 3),
+    ATTR_TIMER_HOURS: (5, 7, 4),
+    ATTR_TIMER_TIME_ELAPSED_MINS: (6, 11, 11),
+    ATTR_BRIGHTNESS: (7, 22, 7),
+    ATTR_LIGHT_MODE: (8, 29, 2),
+}
+_BOOL_FIELDS = {ATTR_IS_ONLINE, ATTR_POWER, ATTR_LED, ATTR_SLEEP}
+_BROADCAST_PRESENT = sum(
+    1 << _FIELDS[attr][0]
+    for attr in (
+        ATTR_POWER,
+        ATTR_LED,
+        ATTR_SLEEP,
+        ATTR_SPEED,
+        ATTR_TIMER_HOURS,
+        ATTR_TIMER_TIME_ELAPSED_MINS,
+    )
+)
+
+
+def _field_mask(attr: str) -> int:
+    _, shift, width = _FIELDS[attr]
+    return ((1 << width) - 1) << shift
+
+
+def _encode_field(attr: str, value: Any) -> int | None:
+    """Encode value of a packed attribute, None if it doesn't fit."""
+    _, shift, width = _FIELDS[attr]
+    if attr in _BOOL_FIELDS:
+        raw = int(value) if type(value) is bool else None
+    elif attr == ATTR_LIGHT_MODE:
+        raw = LIGHT_MODES.index(value) if value in LIGHT_MODES else None
+    else:
+        raw = value if type(value) is int and 0 <= value < 1 << width else None
+    return None if raw is None else raw << shift
+
+
+class DeviceState(Mapping[str, Any]):
+    """Immutable device state packed into a bitfield, decoded on access.
+
+    Values which don't fit the packed layout, e.g. extra keys from cloud, are
+    kept in a small dict.
+    """
+
+    __slots__ = ("_bits", "_extra", "_present")
+
+    def __init__(
+        self, bits: int = 0, present: int = 0, extra: dict[str, Any] | None = None
+    ) -> None:
+        """Init device state."""
+        self._bits = bits
+        self._present = present
+        self._extra = extra
+
+    @classmethod
+    def from_mapping(cls, state: Mapping[str, Any]) -> "DeviceState":
+        """Create state from a mapping."""
+        return EMPTY_STATE.merge(state)
+
+    @classmethod
+    def from_state_value(
+        cls, value: int, supports_brightness_control: bool, supports_color_effect: bool
+    ) -> "DeviceState":
+        """Create state from the value of a UDP broadcast state_string."""
+        bits = (
+            (0x10 & value) >> 3  # Power
+            | (0x20 & value) >> 3  # LED
+            | (0x80 & value) >> 4  # Sleep
+            | (0x07 & value) << 4  # Speed
+            | (0x0F0000 & value) >> 9  # Timer hours
+            | ((0xFF000000 & value) >> (24 - 2)) << 11  # Timer elapsed minutes
+        )
+        present = _BROADCAST_PRESENT
+
+        # Set brightness value if device supports brightness control
+        if supports_brightness_control:
+            bits |= ((0x7F00 & value) >> 8) << 22
+            present |= 1 << _FIELDS[ATTR_BRIGHTNESS][0]
+
+        # Set color mode if device supports color modes
+        if supports_color_effect:
+            cool = (0x08 & value) > 0
+            warm = (0x8000 & value) > 0
+
+            if cool and warm:
+                light_mode = LIGHT_MODE_DAYLIGHT
+            elif cool:
+                light_mode = LIGHT_MODE_COOL
+            else:
+                light_mode = LIGHT_MODE_WARM
+
+            bits |= _encode_field(ATTR_LIGHT_MODE, light_mode)
+            present |= 1 << _FIELDS[ATTR_LIGHT_MODE][0]
+
+        return cls(bits, present)
+
+    def merge(self, changes: Mapping[str, Any]) -> "DeviceState":
+        """Get a new state with changes applied."""
+        if isinstance(changes, DeviceState):
+            clear = sum(
+                _field_mask(attr)
+                for attr, (index, _, _) in _FIELDS.items()
+                if changes._present >> index & 1
+            )
+            bits = self._bits & ~clear | changes._bits
+            present = self._present | changes._present
+            extra = self._extra
+            if extra is not None and changes._extra is None:
+                extra = {k: v for k, v in extra.items() if k not in changes} or None
+            elif changes._extra is not None:
+                extra = {**(extra or {}), **changes._extra}
+            return DeviceState(bits, present, extra)
+
+        bits, present, extra = self._bits, self._present, self._extra
+        for attr, value in changes.items():
+            if attr in _FIELDS and (encoded := _encode_field(attr, value)) is not None:
+                index = _FIELDS[attr][0]
+                bits = bits & ~_field_mask(attr) | encoded
+                present |= 1 << index
+                if extra is not None and attr in extra:
+                    extra = {k: v for k, v in extra.items() if k != attr} or None
+            else:
+                if attr in _FIELDS:
+                    present &= ~(1 << _FIELDS[attr][0])
+                extra = {**(extra or {}), attr: value}
+        return DeviceState(bits, present, extra)
+
+    def __getitem__(self, key: str) -> Any:
+        """Decode a single attribute."""
+        if (field := _FIELDS.get(key)) is not None:
+            index, shift, width = field
+            if self._present >> index & 1:
+                raw = (self._bits >> shift) & ((1 << width) - 1)
+                if key in _BOOL_FIELDS:
+                    return raw == 1
+                if key == ATTR_LIGHT_MODE:
+                    return LIGHT_MODES[raw]
+                return raw
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over present attributes."""
+        for attr, (index, _, _) in _FIELDS.items():
+            if self._present >> index & 1:
+                yield attr
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        """Get number of present attributes."""
+        return self._present.bit_count() + len(self._extra or ())
+
+    def __eq__(self, other: object) -> bool:
+        """Compare states, without decoding when both are packed."""
+        if isinstance(other, DeviceState):
+            return (
+                self._bits == other._bits
+                and self._present == other._present
+                and self._extra == other._extra
+            )
+        return super().__eq__(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Get representation."""
+        return f"DeviceState({dict(self)})"
+
+
+EMPTY_STATE = DeviceState()
+ONLINE_STATE = DeviceState.from_mapping({ATTR_IS_ONLINE: True})
+
+
+def _drop_led_toggle(command: dict[str, Any]) -> dict[str, Any]:
+    """Drop LED on/off, which can't be combined with brightness or light mode."""
+    if ATTR_LED in command and command.keys() & {ATTR_BRIGHTNESS, ATTR_LIGHT_MODE}:
+        del command[ATTR_LED]
+    return command
+
+
+def decode_state_string(
+    state_string: str, supports_brightness_control: bool, supports_color_effect: bool
+) -> DeviceState | None:
+    """Decode state_string of a UDP broadcast into an immutable state."""
+    value = state_string.split(",", maxsplit=1)[0].strip()
+    if not value.isnumeric():
+        return None
+    return DeviceState.from_state_value(
+        int(value), supports_brightness_control, supports_color_effect
+    )
+
+
 class AtombergDevice:
     """Atomberg device."""
 
+    __slots__ = (
+        "_api",
+        "_broadcast_state",
+        "_cadence",
+        "_coalescer",
+        "_color",
+        "_data",
+        "_device_id",
+        "_generation",
+        "_hass",
+        "_ip_addr",
+        "_last_seen",
+        "_model",
+        "_name",
+        "_on_update",
+        "_optimistic",
+        "_options",
+        "_paths",
+        "_polled",
+        "_reconcile_timers",
+        "_sender",
+        "_series",
+        "_state",
+        "_tracker",
+    )
+
     def __init__(
         self,
+        hass: HomeAssistant,
         data: dict[str, Any],
         api: AtombergCloudAPI,
-        config_entry: ConfigEntry = None,
+        sender: UDPSender,
+        *,
+        options: Mapping[str, Any] | None = None,
+        on_update: Callable[[str], None] | None = None,
     ) -> None:
         """Init Atomberg device."""
         self._device_id = data["device_id"]
@@ -55,17 +309,27 @@ class AtombergDevice:
         self._series = data["series"]
         self._model = data["model"]
         self._name = data["name"]
+        self._hass = hass
         self._api = api
-        self._state: dict = data["state"]
+        self._sender = sender
+        # The device list entry of the API, which is persisted as snapshot
+        self._data = data
+        self._state = DeviceState.from_mapping(data["state"])
+        data["state"] = self._state
+        self._generation = 0
         self._last_seen: int = None
+        self._polled = False
         self._ip_addr: str = None
-        self._options = config_entry.options if config_entry else {}
-
-        # Add options update listener
-        if config_entry:
-            config_entry.async_on_unload(
-                config_entry.add_update_listener(self._update_options)
-            )
+        self._options = options or {}
+        self._coalescer = CommandCoalescer(hass, self._async_send_coalesced_command)
+        self._tracker = LocalCommandTracker()
+        self._paths = PathSelector()
+        self._broadcast_state: DeviceState | None = None
+        self._cadence = BroadcastCadence(AVAILABILITY_TIMEOUT)
+        self._on_update = on_update
+        # Values of sent commands not yet confirmed by the device
+        self._optimistic: dict[str, Any] = {}
+        self._reconcile_timers: dict[str, CALLBACK_TYPE] = {}
 
     @property
     def supports_brightness_control(self):
@@ -78,9 +342,14 @@ class AtombergDevice:
         return self.series in SUPPORTED_COLOR_EFFECT_SERIES
 
     @property
-    def state(self) -> dict[str, Any]:
-        """Get state."""
-        return deepcopy(self._state)
+    def state(self) -> DeviceState:
+        """Get read-only state, replaced as a whole on every change."""
+        return self._state
+
+    @property
+    def generation(self) -> int:
+        """Get counter increased on every change of state."""
+        return self._generation
 
     @property
     def name(self) -> str:
@@ -112,11 +381,49 @@ class AtombergDevice:
         """Get last seen UTC timestamp."""
         return self._last_seen
 
+    @property
+    def polled(self) -> bool:
+        """Whether the state currently comes from cloud polling."""
+        return self._polled
+
     @property
     def ip_address(self) -> str | None:
         """Get IP address."""
         return self._ip_addr
 
+    @property
+    def local_command_metrics(self) -> EndpointMetrics:
+        """Get confirmation latency and failures of local commands."""
+        return self._tracker.metrics
+
+    @property
+    def broadcast_cadence(self) -> BroadcastCadence:
+        """Get learned broadcast cadence."""
+        return self._cadence
+
+    @property
+    def offline_timeout(self) -> float:
+        """Get seconds without broadcasts after which the device is offline."""
+        return self._cadence.timeout
+
+    @property
+    def command_paths(self) -> PathSelector:
+        """Get health of the local and cloud command paths."""
+        return self._paths
+
+    @property
+    def uses_local_control(self) -> bool:
+        """Whether the next command is sent over UDP."""
+        return self._select_path() == CommandPath.LOCAL
+
+    def _select_path(self) -> CommandPath:
+        """Select the path of the next command."""
+        return self._paths.select(
+            local_available=bool(self.ip_address),
+            cloud_available=self._api.available,
+            prefer_cloud=self._options.get(CONF_USE_CLOUD_CONTROL, False),
+        )
+
     @property
     def mac(self) -> str:
         """Get MAC address."""
@@ -124,66 +431,201 @@ class AtombergDevice:
 
     def update_last_seen(self, value: float):
         """Update last seen timestamp."""
+        if self._last_seen:
+            self._cadence.record(value - self._last_seen)
         self._last_seen = value
+        self._polled = False
 
     def update_ip_address(self, value: str):
         """Update IP address."""
         if self._ip_addr != value:
             _LOGGER.debug("IP address updated for %s: %s", self.name, value)
             self._ip_addr = value
+            # Failures at the old address don't apply to the new one
+            self._paths.local.reset()
 
-    async def _update_options(self, hass: HomeAssistant, config_entry: ConfigEntry):
+    def update_options(self, options: Mapping[str, Any]):
         """Update options."""
-        self._options = config_entry.options
+        self._options = options
         _LOGGER.debug("Options updated for %s: %s", self.name, self._options)
 
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel pending commands and reconcile timers."""
+        self._coalescer.async_shutdown()
+        for cancel in self._reconcile_timers.values():
+            cancel()
+        self._reconcile_timers.clear()
+
+    async def _async_send_coalesced_command(self, command: dict) -> bool:
+        """Send merged command of the coalescer."""
+        return await self._async_send_command(_drop_led_toggle(command))
+
     async def _async_send_command(self, command: dict) -> bool:
         """Send command to the device."""
-        if not self._options.get(CONF_USE_CLOUD_CONTROL, False) and self.ip_address:
-            message = json.dumps(command).encode()
-            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-                sent_bytes = sock.sendto(message, (self.ip_address, 5600))
-                res = sent_bytes > 0
-                if res:
-                    _LOGGER.debug(
-                        "Command sent to %s (%s): %s",
-                        self.name,
-                        self.ip_address,
-                        command,
-                    )
-                else:
-                    _LOGGER.error(
-                        "Failed to send command to %s (%s): %s",
-                        self.name,
-                        self.ip_address,
-                        command,
-                    )
-                return res
+        # Keep order with commands still waiting in the coalescer
+        await self._coalescer.async_flush()
+
+        optimistic = self._command_state(command)
+        if self.uses_local_control:
+            start = time.monotonic()
+            res = await self._tracker.async_send(
+                partial(self._async_send_local_command, command, optimistic),
+                self._expected_state(command),
+            )
+            self._paths.record(CommandPath.LOCAL, res, time.monotonic() - start)
+            if res:
+                return True
+            if not self._api.available:
+                self._reconcile(optimistic)
+                return False
+            _LOGGER.warning(
+                "%s didn't confirm local command, sending over cloud: %s",
+                self.name,
+                command,
+            )
+
+        start = time.monotonic()
+        try:
+            res = await self._api.async_send_command(self.id, command)
+        except CannotConnect:
+            self._paths.record(CommandPath.CLOUD, False, time.monotonic() - start)
+            raise
+        self._paths.record(CommandPath.CLOUD, res, time.monotonic() - start)
+        if res:
+            self._apply_optimistic(optimistic)
+            return True
+        self._reconcile(optimistic)
+        return False
+
+    async def _async_send_local_command(
+        self, command: dict, optimistic: dict[str, Any]
+    ) -> bool:
+        """Send command to the device over UDP."""
+        message = json.dumps(command).encode()
+        if res := await self._sender.async_send(message, self.ip_address):
+            _LOGGER.debug(
+                "Command sent to %s (%s): %s",
+                self.name,
+                self.ip_address,
+                command,
+            )
+            self._apply_optimistic(optimistic)
         else:
-            return await self._api.async_send_command(self.id, command)
+            _LOGGER.error(
+                "Failed to send command to %s (%s): %s",
+                self.name,
+                self.ip_address,
+                command,
+            )
+        return res
+
+    @staticmethod
+    def _command_state(command: Mapping[str, Any]) -> dict[str, Any]:
+        """Get the state a command sets."""
+        state = dict(command)
+        if (timer := state.pop(ATTR_TIMER, None)) is not None:
+            state[ATTR_TIMER_HOURS] = TIMER_MAPPING[timer][0]
+        return state
+
+    def _apply_optimistic(self, values: dict[str, Any]) -> None:
+        """Show the state of a sent command until the device confirms it."""
+        shown = values.items() <= self._optimistic.items()
+        self._optimistic.update(values)
+        # Restart the timeout on retransmits and when falling back to cloud
+        for attr, value in values.items():
+            if cancel := self._reconcile_timers.pop(attr, None):
+                cancel()
+            self._reconcile_timers[attr] = async_call_later(
+                self._hass,
+                OPTIMISTIC_TIMEOUT,
+                partial(self._async_reconcile_timeout, {attr: value}, self._last_seen),
+            )
+        if not shown and self.update_state(values):
+            self._notify()
+
+    @callback
+    def _async_reconcile_timeout(
+        self, values: dict[str, Any], sent_last_seen: float | None, _now: datetime
+    ) -> None:
+        """Reconcile values still unconfirmed when the timeout elapses."""
+        self._reconcile(values, sent_last_seen)
+
+    def _reconcile(
+        self, values: dict[str, Any], sent_last_seen: float | None = None
+    ) -> None:
+        """Roll back optimistic values the device didn't confirm.
+
+        When `sent_last_seen` is given, the command was accepted and is only
+        rolled back if a broadcast was received after it was sent.
+        """
+        # Skip values confirmed meanwhile or replaced by a later command
+        unconfirmed = {
+            attr: value
+            for attr, value in values.items()
+            if attr in self._optimistic and self._optimistic[attr] == value
+        }
+        for attr in unconfirmed:
+            del self._optimistic[attr]
+            if cancel := self._reconcile_timers.pop(attr, None):
+                cancel()
+
+        if (
+            self._broadcast_state is None
+            or self._polled
+            or (sent_last_seen is not None and self._last_seen == sent_last_seen)
+        ):
+            # Nothing authoritative to compare with, cloud polling settles it
+            return
+        actual = {
+            attr: self._broadcast_state[attr]
+            for attr, value in unconfirmed.items()
+            if attr in self._broadcast_state and self._broadcast_state[attr] != value
+        }
+        if actual:
+            _LOGGER.warning(
+                "%s didn't confirm %s, rolling back to %s",
+                self.name,
+                {attr: unconfirmed[attr] for attr in actual},
+                actual,
+            )
+            if self.update_state(actual):
+                self._notify()
+
+    def _notify(self) -> None:
+        """Notify listeners of a state change made by the device itself."""
+        if self._on_update is not None:
+            self._on_update(self.id)
+
+    def _expected_state(self, command: Mapping[str, Any]) -> dict[str, Any]:
+        """Get the broadcast state confirming a command."""
+        confirmable = {ATTR_POWER, ATTR_SPEED, ATTR_SLEEP, ATTR_LED}
+        if self.supports_brightness_control:
+            confirmable.add(ATTR_BRIGHTNESS)
+        if self.supports_color_effect:
+            confirmable.add(ATTR_LIGHT_MODE)
+        expected = {attr: v for attr, v in command.items() if attr in confirmable}
+        if ATTR_TIMER in command:
+            # Broadcasts carry the hours of the timer instead of its index
+            expected[ATTR_TIMER_HOURS] = TIMER_MAPPING[command[ATTR_TIMER]][0]
+        return expected
 
     async def async_turn_on(self):
         """Turn on."""
-        cmd = {ATTR_POWER: True}
-        if await self._async_send_command(cmd):
+        if await self._async_send_command({ATTR_POWER: True}):
             _LOGGER.debug("%s: turned on", self.name)
-            self.update_state(cmd)
 
     async def async_turn_off(self):
         """Turn off."""
-        cmd = {ATTR_POWER: False}
-        if await self._async_send_command(cmd):
+        if await self._async_send_command({ATTR_POWER: False}):
             _LOGGER.debug("%s: turned off", self.name)
-            self.update_state(cmd)
 
     async def async_set_speed(self, value: int):
         """Set speed."""
         if value not in range(1, 7):
             raise ValueError("Value must in range of 1-6.")
-        cmd = {ATTR_SPEED: value}
-        if await self._async_send_command(cmd):
+        if await self._coalescer.async_send({ATTR_SPEED: value}):
             _LOGGER.debug("%s: set speed %d", self.name, value)
-            self.update_state(cmd)
 
     async def async_send_light_command(self, cmd: dict):
         """Send combined light command."""
@@ -191,35 +633,146 @@ class AtombergDevice:
         if not set(cmd.keys()).issubset(supported_cmds):
             raise ValueError(f"Supported commands are: {', '.join(supported_cmds)}")
 
-        if len(cmd) > 1 and ATTR_LED in cmd:
-            del cmd[ATTR_LED]
+        # Turning LED off is sent right away, so it isn't merged with later values
+        if cmd.get(ATTR_LED, True):
+            res = await self._coalescer.async_send(cmd)
+        else:
+            res = await self._async_send_command(cmd)
 
-        if await self._async_send_command(cmd):
+        if res:
             _LOGGER.debug("%s: Light command executed successfully.", self.name)
-            self.update_state(cmd)
 
     async def async_turn_on_sleep_mode(self):
         """Turn on sleep mode."""
-        cmd = {ATTR_SLEEP: True}
-        if await self._async_send_command(cmd):
+        if await self._async_send_command({ATTR_SLEEP: True}):
             _LOGGER.debug("%s: turned on sleep mode", self.name)
-            self.update_state(cmd)
 
     async def async_turn_off_sleep_mode(self):
         """Turn off sleep mode."""
-        cmd = {ATTR_SLEEP: False}
-        if await self._async_send_command(cmd):
+        if await self._async_send_command({ATTR_SLEEP: False}):
             _LOGGER.debug("%s: turned off sleep mode", self.name)
-            self.update_state(cmd)
 
     async def async_set_timer(self, value: int):
         """Set timer."""
         if value not in range(5):
             raise ValueError("Value must in range of 0-4.")
-        if await self._api.async_send_command(self.id, {"timer": value}):
-            _LOGGER.debug("%s: set sleep mode: %d", self.name, value)
-            self.update_state({ATTR_TIMER_HOURS: TIMER_MAPPING[value][0]})
-
-    def update_state(self, new_state: dict):
-        """Update states."""
-        self._state.update(new_state)
+        if await self._async_send_command({ATTR_TIMER: value}):
+            _LOGGER.debug("%s: set timer: %d", self.name, value)
+
+    async def async_set_state(self, target: Mapping[str, Any]) -> bool:
+        """Set several attributes at once, in as few commands as possible."""
+        self._validate_target(target)
+        commands = self._split_commands(target)
+
+        # Commands are independent of each other, send them concurrently
+        results = await asyncio.gather(
+            *(self._async_send_command(cmd) for cmd in commands)
+        )
+
+        if res := all(results):
+            _LOGGER.debug("%s: set state %s", self.name, target)
+        return res
+
+    def _validate_target(self, target: Mapping[str, Any]) -> None:
+        """Validate target state of async_set_state."""
+        supported = {attr for group in COMMAND_GROUPS for attr in group}
+        if not target.keys() <= supported:
+            raise ValueError(f"Supported attributes are: {', '.join(supported)}")
+        if ATTR_SPEED in target and target[ATTR_SPEED] not in range(1, 7):
+            raise ValueError("Speed must in range of 1-6.")
+        if ATTR_TIMER in target and target[ATTR_TIMER] not in range(5):
+            raise ValueError("Timer must in range of 0-4.")
+        if ATTR_BRIGHTNESS in target and not self.supports_brightness_control:
+            raise ValueError(f"{self.name} doesn't support brightness control.")
+        if ATTR_LIGHT_MODE in target and not self.supports_color_effect:
+            raise ValueError(f"{self.name} doesn't support light modes.")
+
+    @staticmethod
+    def _split_commands(target: Mapping[str, Any]) -> list[dict[str, Any]]:
+        """Split target state into the commands to send."""
+        commands = []
+        for group in COMMAND_GROUPS:
+            cmd = {attr: target[attr] for attr in group if attr in target}
+            if cmd.get(ATTR_POWER) is False:
+                # Other fan attributes don't apply to a fan turned off
+                cmd = {ATTR_POWER: False}
+            if cmd.get(ATTR_LED) is False:
+                cmd = {ATTR_LED: False}
+            else:
+                _drop_led_toggle(cmd)
+            if cmd:
+                commands.append(cmd)
+        return commands
+
+    def update_state(self, new_state: Mapping[str, Any]) -> bool:
+        """Update states, return whether anything changed."""
+        # States are immutable, so one handed out earlier never changes
+        updated = self._state.merge(new_state)
+        if updated == self._state:
+            return False
+
+        self._data["state"] = self._state = updated
+        self._generation += 1
+        return True
+
+    def decode_state_string(self, state_string: str) -> DeviceState | None:
+        """Decode state_string of a UDP broadcast of this device."""
+        return decode_state_string(
+            state_string, self.supports_brightness_control, self.supports_color_effect
+        )
+
+    def update_broadcast_state(self, state: DeviceState) -> bool:
+        """Update states from a broadcast of the device."""
+        self._broadcast_state = state
+        self._tracker.confirm(state)
+        return self.update_state(self._with_optimistic(state.merge(ONLINE_STATE)))
+
+    def replay_broadcast_state(self) -> bool:
+        """Apply the last broadcast again, e.g. after the device was offline."""
+        if self._broadcast_state is None:
+            return self.update_state(ONLINE_STATE)
+        return self.update_broadcast_state(self._broadcast_state)
+
+    def confirm_broadcast(self) -> None:
+        """Confirm pending local commands with a repeated broadcast."""
+        if self._broadcast_state is not None:
+            self._tracker.confirm(self._broadcast_state)
+
+    def update_polled_state(self, new_state: Mapping[str, Any]) -> bool:
+        """Update states polled from cloud while the device is silent on UDP."""
+        self._polled = True
+        return self.update_state(self._with_optimistic(new_state))
+
+    def _with_optimistic(self, state: Mapping[str, Any]) -> Mapping[str, Any]:
+        """Apply unconfirmed command values over an authoritative state."""
+        if not self._optimistic:
+            return state
+        for attr, value in list(self._optimistic.items()):
+            if state.get(attr) == value:
+                del self._optimistic[attr]
+                if cancel := self._reconcile_timers.pop(attr, None):
+                    cancel()
+        # Keep showing commands in flight until confirmed or reconciled
+        return {**state, **self._optimistic}
+
+
+async def async_set_group_state(
+    devices: Iterable[AtombergDevice],
+    target: Mapping[str, Any],
+    cloud_concurrency: int = GROUP_CLOUD_CONCURRENCY,
+) -> dict[str, bool | BaseException]:
+    """Set the same state on many devices, return the result of each device."""
+    devices = list(devices)
+    semaphore = asyncio.Semaphore(cloud_concurrency)
+
+    async def _async_set_state(device: AtombergDevice) -> bool:
+        if device.uses_local_control:
+            return await device.async_set_state(target)
+        async with semaphore:
+            return await device.async_set_state(target)
+
+    # Tasks start in the same loop iteration, so local commands go out at once
+    results = await asyncio.gather(
+        *(_async_set_state(device) for device in devices), return_exceptions=True
+    )
+    return {device.id: res for device, res in zip(devices, results, strict=True)}
@@ -0,0 +1,50 @@
+"""Diagnostics support for Atomberg integration."""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_CONTROL_METHOD,
+    CONF_REFRESH_TOKEN,
+    DOMAIN,
+    ENTRIES,
+    ControlMethod,
+)
+from .coordinator import AtombergDataUpdateCoordinator
+
+TO_REDACT = {CONF_API_KEY, CONF_REFRESH_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    diagnostics: dict[str, Any] = {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+    }
+    if entry.data.get(CONF_CONTROL_METHOD) == ControlMethod.IR:
+        return diagnostics
+
+    coordinator: AtombergDataUpdateCoordinator = hass.data[DOMAIN][ENTRIES][
+        entry.entry_id
+    ]
+    diagnostics["cloud_api"] = coordinator.api.diagnostics
+    diagnostics["udp_sender"] = coordinator.udp_sender.diagnostics
+    diagnostics["devices"] = {
+        device.id: {
+            "series": device.series,
+            "model": device.model,
+            "last_seen": device.last_seen,
+            "polled": device.polled,
+            "local_commands": device.local_command_metrics.as_dict(),
+            "broadcast_cadence": device.broadcast_cadence.as_dict(),
+            "command_paths": device.command_paths.as_dict(),
+            "state": dict(device.state),
+        }
+        for device in coordinator.devices
+    }
+    return diagnostics
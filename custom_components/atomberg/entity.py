@@ -1,8 +1,10 @@
 """Base Atomberg entity."""
 
-from datetime import datetime, timedelta
+import time
+from collections.abc import Mapping
+from datetime import datetime
 from logging import Logger
-from typing import TypeVar
+from typing import Any, TypeVar
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
@@ -11,32 +13,31 @@ from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util.dt import utcnow
 
 from .const import DOMAIN, ENTRIES, MANUFACTURER
 from .coordinator import AtombergDataUpdateCoordinator
 from .device import (
-    ATTR_BRIGHTNESS,
     ATTR_IS_ONLINE,
     ATTR_LED,
-    ATTR_LIGHT_MODE,
     ATTR_POWER,
-    ATTR_SLEEP,
     ATTR_SPEED,
     ATTR_TIMER_HOURS,
-    ATTR_TIMER_TIME_ELAPSED_MINS,
-    LIGHT_MODE_COOL,
-    LIGHT_MODE_DAYLIGHT,
-    LIGHT_MODE_WARM,
     AtombergDevice,
 )
 
-AVAILABILITY_TIMEOUT = 10  # Seconds
-
 _EntityT = TypeVar("_EntityT", bound="AtombergEntity")
 
+# Changes of these are written right away, even for throttled entities
+THROTTLE_BYPASS_ATTRIBUTES = (
+    ATTR_IS_ONLINE,
+    ATTR_POWER,
+    ATTR_SPEED,
+    ATTR_LED,
+    ATTR_TIMER_HOURS,
+)
+
 
 async def platform_async_setup_entry(
     hass: HomeAssistant,
@@ -57,6 +58,11 @@ async def platform_async_setup_entry(
 class AtombergEntity(CoordinatorEntity, Entity):
     """Atomberg base entity."""
 
+    # Attributes of the device state the entity shows, None for all
+    _state_attributes: frozenset[str] | None = None
+    # Minimum seconds between state writes, 0 to write every change
+    _min_write_interval: float = 0
+
     def __init__(
         self,
         coordinator: AtombergDataUpdateCoordinator,
@@ -64,11 +70,15 @@ class AtombergEntity(CoordinatorEntity, Entity):
         logger: Logger,
     ) -> None:
         """Init Atomberg base entity."""
-        super().__init__(coordinator)
+        # Listen only to updates of this device
+        super().__init__(coordinator, context=device.id)
 
         self.hass = coordinator.hass
         self._device = device
-        self._attr_device_state = self._device.state
+        self._state_generation = self._device.generation
+        self._written_state = self._device.state
+        self._last_write = 0.0
+        self._cancel_flush = None
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, self._get_unique_id())},
             connections={(dr.CONNECTION_NETWORK_MAC, self._device.mac)},
@@ -77,7 +87,6 @@ class AtombergEntity(CoordinatorEntity, Entity):
             model=self._device.model,
         )
         self._logger = logger
-        self._stop_availability_refresher = None
 
     def _get_unique_id(
         self, platform: Platform | None = None, suffix: str | None = None
@@ -95,95 +104,62 @@ class AtombergEntity(CoordinatorEntity, Entity):
         return self.device_state[ATTR_IS_ONLINE]
 
     @property
-    def device_state(self) -> dict:
+    def device_state(self) -> Mapping[str, Any]:
         """Get device state."""
-        return self._attr_device_state
+        return self._device.state
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        if self.coordinator.data["device_id"] != self._device.id:
-            return
-
-        state = {}
-        # Decode the state data
-        if state_string := self.coordinator.data.get("state_string"):
-            value = state_string.split(",")[0].strip()
-            if not value.isnumeric():
-                return
-            value = int(value)
-
-            state.update(
-                {
-                    ATTR_POWER: (0x10) & value > 0,
-                    ATTR_LED: (0x20) & value > 0,
-                    ATTR_SLEEP: (0x80) & value > 0,
-                    ATTR_SPEED: (0x07) & value,
-                    ATTR_TIMER_HOURS: (0x0F0000 & value) >> 16,
-                    ATTR_TIMER_TIME_ELAPSED_MINS: (0xFF000000 & value) >> (24 - 2),
-                }
-            )
-
-            # Set brightness value if device supports brightness control
-            if self._device.supports_brightness_control:
-                state[ATTR_BRIGHTNESS] = ((0x7F00) & value) >> 8
-
-            # Set color mode if device supports color modes
-            if self._device.supports_color_effect:
-                cool = ((0x08) & value) > 0
-                warm = ((0x8000) & value) > 0
-
-                if cool and warm:
-                    light_mode = LIGHT_MODE_DAYLIGHT
-                elif cool:
-                    light_mode = LIGHT_MODE_COOL
-                else:
-                    light_mode = LIGHT_MODE_WARM
-
-                state[ATTR_LIGHT_MODE] = light_mode
-
-        self._device.update_state({**state, ATTR_IS_ONLINE: True})
-        self._device.update_ip_address(self.coordinator.data.get("ip_address"))
-        self._device.update_last_seen(utcnow().timestamp())
+        # The coordinator already decoded and applied the state of this device
         self.update_ha_state_if_required()
 
     def update_ha_state_if_required(self):
         """Update entity state on HA if required."""
-        if self.device_state != self._device.state:
-            self._attr_device_state = self._device.state
-            self.async_schedule_update_ha_state()
+        if self._state_generation == self._device.generation:
+            return
+        self._state_generation = self._device.generation
+
+        state, written = self._device.state, self._written_state
+        if self._state_attributes is not None and all(
+            state.get(attr) == written.get(attr)
+            for attr in (ATTR_IS_ONLINE, *self._state_attributes)
+        ):
+            # Nothing shown by this entity changed
+            return
+
+        if self._min_write_interval and all(
+            state.get(attr) == written.get(attr) for attr in THROTTLE_BYPASS_ATTRIBUTES
+        ):
+            delay = self._last_write + self._min_write_interval - time.monotonic()
+            if delay > 0:
+                # Write the latest state once the interval has passed
+                if self._cancel_flush is None:
+                    self._cancel_flush = async_call_later(
+                        self.hass, delay, self._async_flush_state
+                    )
+                return
+
+        self._async_write_device_state()
 
     @callback
-    def _refresh_availability(self, now: datetime):
-        """Update is_online state based on last_seen."""
-        if self._device.last_seen and self.available:
-            self._logger.debug(
-                "Refreshing availability of %s (%s) - (%s)",
-                self._device.name,
-                self._device.id,
-                self.name,
-            )
-            self._device.update_state(
-                {
-                    ATTR_IS_ONLINE: now.timestamp() - self._device.last_seen
-                    <= AVAILABILITY_TIMEOUT
-                }
-            )
-            self.update_ha_state_if_required()
-
-    async def async_added_to_hass(self) -> None:
-        """Run when entity is added to hass."""
-        await super().async_added_to_hass()
-
-        # Start availability refresher
-        self._stop_availability_refresher = async_track_time_interval(
-            self.hass,
-            self._refresh_availability,
-            timedelta(seconds=AVAILABILITY_TIMEOUT),
-        )
+    def _async_flush_state(self, now: datetime) -> None:
+        """Write state held back by the throttle."""
+        self._cancel_flush = None
+        self._async_write_device_state()
+
+    @callback
+    def _async_write_device_state(self) -> None:
+        """Write current device state to HA."""
+        if self._cancel_flush is not None:
+            self._cancel_flush()
+            self._cancel_flush = None
+        self._written_state = self._device.state
+        self._last_write = time.monotonic()
+        self.async_schedule_update_ha_state()
 
     async def async_will_remove_from_hass(self) -> None:
         """Run when entity will be removed from hass."""
-        # Stop availability refresher
-        if self._stop_availability_refresher:
-            self._stop_availability_refresher()
-            self._stop_availability_refresher = None
+        await super().async_will_remove_from_hass()
+        if self._cancel_flush is not None:
+            self._cancel_flush()
+            self._cancel_flush = None
@@ -6,7 +6,9 @@ from typing import Any
 from homeassistant.components.fan import FanEntity, FanEntityFeature
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util.percentage import (
     ordered_list_item_to_percentage,
@@ -18,6 +20,12 @@ from .coordinator import AtombergDataUpdateCoordinator
 from .device import ATTR_POWER, ATTR_SPEED, AtombergDevice
 from .entity import AtombergEntity, platform_async_setup_entry
 from .ir_fan import async_setup_entry as ir_fan_async_setup_entry
+from .services import (
+    SERVICE_SET_STATE,
+    TARGET_STATE_SCHEMA,
+    target_state_from_service_data,
+    validate_target_state,
+)
 
 _LOGGER = getLogger(__name__)
 
@@ -36,6 +44,20 @@ async def async_setup_entry(
 
     await platform_async_setup_entry(hass, entry, async_add_entities, AtombergFanEntity)
 
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_SET_STATE, TARGET_STATE_SCHEMA, _async_handle_set_state
+    )
+
+
+async def _async_handle_set_state(entity: FanEntity, call: ServiceCall) -> None:
+    """Handle set_state, the service targets IR fans of the integration too."""
+    if not isinstance(entity, AtombergFanEntity):
+        raise ServiceValidationError(
+            f"{entity.entity_id} is controlled over IR and doesn't support set_state"
+        )
+    await entity.async_set_state(**call.data)
+
 
 class AtombergFanEntity(AtombergEntity, FanEntity):
     """Atomberg Fan."""
@@ -45,6 +67,7 @@ class AtombergFanEntity(AtombergEntity, FanEntity):
         | FanEntityFeature.TURN_OFF
         | FanEntityFeature.SET_SPEED
     )
+    _state_attributes = frozenset({ATTR_POWER, ATTR_SPEED})
 
     def __init__(
         self,
@@ -93,3 +116,9 @@ class AtombergFanEntity(AtombergEntity, FanEntity):
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the entity."""
         await self._device.async_turn_off()
+
+    async def async_set_state(self, **kwargs: Any) -> None:
+        """Set several attributes of the fan at once."""
+        target = target_state_from_service_data(kwargs)
+        validate_target_state(self._device, target)
+        await self._device.async_set_state(target)
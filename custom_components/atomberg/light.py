@@ -49,6 +49,8 @@ async def async_setup_entry(
 class AtombergFanLightEntity(AtombergEntity, LightEntity):
     """Light entity for Atomberg fans."""
 
+    _state_attributes = frozenset({ATTR_LED, ATTR_BRIGHTNESS, ATTR_LIGHT_MODE})
+
     def __init__(
         self, coordinator: AtombergDataUpdateCoordinator, device: AtombergDevice
     ) -> None:
@@ -0,0 +1,92 @@
+"""Request metrics for Atomberg Cloud API."""
+
+from bisect import bisect_left
+from collections import Counter
+from typing import Any
+
+# Upper bounds of latency histogram buckets in milliseconds
+LATENCY_BUCKETS_MS = (25, 50, 100, 200, 400, 800, 1600, 3200, 6400, 12800, 25600)
+# Reported for calls slower than the largest bucket
+OVERFLOW_BUCKET_MS = 51200
+
+
+class EndpointMetrics:
+    """Call counts, errors and latency histogram of an endpoint."""
+
+    def __init__(self) -> None:
+        """Init endpoint metrics."""
+        self.calls = 0
+        self.errors: Counter[str] = Counter()
+        self._buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    @property
+    def error_count(self) -> int:
+        """Get total number of failed calls."""
+        return self.errors.total()
+
+    def record(self, latency: float | None, error: str | None = None) -> None:
+        """Record a call which took `latency` seconds, None if never made."""
+        self.calls += 1
+        if error:
+            self.errors[error] += 1
+        if latency is not None:
+            self._buckets[bisect_left(LATENCY_BUCKETS_MS, latency * 1000)] += 1
+
+    def percentile(self, percent: float) -> int | None:
+        """Estimate latency percentile in milliseconds from the histogram."""
+        if not (sampled := sum(self._buckets)):
+            return None
+        rank = sampled * percent / 100
+        seen = 0
+        for bound, count in zip(
+            (*LATENCY_BUCKETS_MS, OVERFLOW_BUCKET_MS), self._buckets, strict=True
+        ):
+            seen += count
+            if count and seen >= rank:
+                return bound
+        return OVERFLOW_BUCKET_MS
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get metrics as a dict."""
+        return {
+            "calls": self.calls,
+            "errors": dict(self.errors),
+            "latency_ms": {
+                "p50": self.percentile(50),
+                "p95": self.percentile(95),
+                "p99": self.percentile(99),
+                "histogram": dict(
+                    zip(
+                        [*(f"<={b}" for b in LATENCY_BUCKETS_MS), "inf"],
+                        self._buckets,
+                        strict=True,
+                    )
+                ),
+            },
+        }
+
+
+class CloudMetrics:
+    """Metrics of all endpoints of a cloud client."""
+
+    def __init__(self) -> None:
+        """Init cloud metrics."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+
+    def get(self, endpoint: str) -> EndpointMetrics:
+        """Get metrics of an endpoint."""
+        if (metrics := self.endpoints.get(endpoint)) is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+        return metrics
+
+    def record(
+        self, endpoint: str, latency: float | None, error: str | None = None
+    ) -> None:
+        """Record a call to an endpoint."""
+        self.get(endpoint).record(latency, error)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get metrics of all endpoints as a dict."""
+        return {
+            endpoint: metrics.as_dict() for endpoint, metrics in self.endpoints.items()
+        }
@@ -0,0 +1,124 @@
+"""Selection of the command path of Atomberg devices."""
+
+import time
+from enum import StrEnum
+from logging import getLogger
+from typing import Any
+
+_LOGGER = getLogger(__name__)
+
+# Weight of the latest command in the moving averages
+HEALTH_SMOOTHING = 0.3
+# Success rate below which a path is considered degraded
+HEALTH_THRESHOLD = 0.5
+# Seconds after which a degraded path is tried again
+HEALTH_PROBE_INTERVAL = 60
+
+
+class CommandPath(StrEnum):
+    """Path a command is sent over."""
+
+    LOCAL = "local"
+    CLOUD = "cloud"
+
+
+class PathHealth:
+    """Moving success rate and latency of a command path."""
+
+    def __init__(self) -> None:
+        """Init path health."""
+        self.success_rate = 1.0
+        self.latency: float | None = None
+        self.last_failure = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        """Whether recent commands over the path mostly succeeded."""
+        return self.success_rate >= HEALTH_THRESHOLD
+
+    @property
+    def due_for_probe(self) -> bool:
+        """Whether a degraded path should be tried again."""
+        return time.monotonic() - self.last_failure >= HEALTH_PROBE_INTERVAL
+
+    def record(self, success: bool, latency: float) -> None:
+        """Record the outcome of a command."""
+        self.success_rate += HEALTH_SMOOTHING * (float(success) - self.success_rate)
+        if success:
+            self.latency = (
+                latency
+                if self.latency is None
+                else self.latency + HEALTH_SMOOTHING * (latency - self.latency)
+            )
+        else:
+            self.last_failure = time.monotonic()
+
+    def reset(self) -> None:
+        """Forget recorded commands."""
+        self.success_rate = 1.0
+        self.latency = None
+        self.last_failure = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get health as a dict."""
+        return {
+            "success_rate": round(self.success_rate, 3),
+            "latency_ms": None if self.latency is None else round(self.latency * 1000),
+            "healthy": self.healthy,
+        }
+
+
+class PathSelector:
+    """Pick the local or cloud path for each command of a device.
+
+    Local is used while both paths are healthy, unless cloud is preferred
+    by the options. Latencies aren't compared, local ones include waiting
+    for the broadcast confirming the command. A degraded path is avoided
+    while the other one is healthy, and probed with the next command every
+    `HEALTH_PROBE_INTERVAL` seconds, also when it isn't the one in use.
+    """
+
+    def __init__(self) -> None:
+        """Init path selector."""
+        self.local = PathHealth()
+        self.cloud = PathHealth()
+
+    def select(
+        self, local_available: bool, cloud_available: bool, prefer_cloud: bool
+    ) -> CommandPath:
+        """Select the path of the next command."""
+        if not local_available:
+            return CommandPath.CLOUD
+        if not cloud_available:
+            return CommandPath.LOCAL
+
+        preferred, other = (
+            (CommandPath.CLOUD, CommandPath.LOCAL)
+            if prefer_cloud
+            else (CommandPath.LOCAL, CommandPath.CLOUD)
+        )
+        for path in (other, preferred):
+            health = self._health(path)
+            if not health.healthy and health.due_for_probe:
+                _LOGGER.debug("Probing degraded %s path", path)
+                return path
+
+        if not self._health(preferred).healthy and self._health(other).healthy:
+            _LOGGER.debug("Using %s path, the %s one is degraded", other, preferred)
+            return other
+        return preferred
+
+    def record(self, path: CommandPath, success: bool, latency: float) -> None:
+        """Record the outcome of a command sent over a path."""
+        self._health(path).record(success, latency)
+
+    def _health(self, path: CommandPath) -> PathHealth:
+        """Get health of a path."""
+        return self.local if path == CommandPath.LOCAL else self.cloud
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get health of both paths as a dict."""
+        return {
+            CommandPath.LOCAL: self.local.as_dict(),
+            CommandPath.CLOUD: self.cloud.as_dict(),
+        }
@@ -0,0 +1,93 @@
+"""Request pacing for Atomberg Cloud API."""
+
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from logging import getLogger
+
+from homeassistant.util.dt import utcnow
+
+_LOGGER = getLogger(__name__)
+
+DEFAULT_RATE = 1.0  # Requests per second
+DEFAULT_CAPACITY = 10  # Burst size
+DEFAULT_RESERVED = 3  # Tokens kept for user commands when the bucket runs low
+DEFAULT_RETRY_AFTER = 10.0  # Seconds, when the API does not tell
+
+
+class RequestPriority(IntEnum):
+    """Priority of a cloud request."""
+
+    BACKGROUND = 0
+    USER = 1
+
+
+def parse_retry_after(value: str | None) -> float:
+    """Parse Retry-After header into seconds."""
+    if not value:
+        return DEFAULT_RETRY_AFTER
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - utcnow()).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+class RequestScheduler:
+    """Token bucket pacing requests of an account.
+
+    Background requests leave the reserved tokens to user commands, so that
+    user commands still go through when the quota runs low.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        capacity: int = DEFAULT_CAPACITY,
+        reserved: int = DEFAULT_RESERVED,
+    ) -> None:
+        """Init request scheduler."""
+        self._rate = rate
+        self._capacity = capacity
+        self._reserved = reserved
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    @property
+    def tokens(self) -> float:
+        """Get available tokens."""
+        self._refill(time.monotonic())
+        return self._tokens
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    async def async_acquire(self, priority: RequestPriority) -> None:
+        """Wait until a request of given priority may be sent."""
+        needed = 1 if priority >= RequestPriority.USER else 1 + self._reserved
+        while True:
+            now = time.monotonic()
+            self._refill(now)
+            wait = self._blocked_until - now
+            if wait <= 0:
+                if self._tokens >= needed:
+                    self._tokens -= 1
+                    return
+                wait = (needed - self._tokens) / self._rate
+            await asyncio.sleep(wait)
+
+    def block_for(self, seconds: float) -> None:
+        """Hold back all requests, e.g. after the API answered 429."""
+        now = time.monotonic()
+        self._blocked_until = max(self._blocked_until, now + seconds)
+        self._tokens = 0.0
+        self._updated = now
+        _LOGGER.warning("Atomberg Cloud rate limit hit, pausing for %.1fs", seconds)
@@ -30,6 +30,8 @@ async def async_setup_entry(
 class SetTimerSelect(AtombergEntity, SelectEntity):
     """Set timer select entity."""
 
+    _state_attributes = frozenset({ATTR_TIMER_HOURS})
+
     def __init__(
         self, coordinator: AtombergDataUpdateCoordinator, device: AtombergDevice
     ) -> None:
@@ -1,13 +1,21 @@
 """Support for sensor entities of Atomberg integration."""
 
 from logging import getLogger
+from typing import Any
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import EntityCategory, Platform, UnitOfTime
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .api import CLOUD_ENDPOINTS, AtombergCloudAPI
+from .const import DOMAIN, ENTRIES, MANUFACTURER
 from .coordinator import AtombergDataUpdateCoordinator
 from .device import ATTR_TIMER_HOURS, ATTR_TIMER_TIME_ELAPSED_MINS, AtombergDevice
 from .entity import AtombergEntity, platform_async_setup_entry
@@ -26,10 +34,22 @@ async def async_setup_entry(
         TimerElapsedTimeSensor,
     )
 
+    coordinator: AtombergDataUpdateCoordinator = hass.data[DOMAIN][ENTRIES][
+        entry.entry_id
+    ]
+    async_add_entities(
+        CloudApiLatencySensor(entry, coordinator.api, endpoint)
+        for endpoint in CLOUD_ENDPOINTS
+    )
+
 
 class TimerElapsedTimeSensor(AtombergEntity, SensorEntity):
     """Timer elapsed time sensor entity."""
 
+    _state_attributes = frozenset({ATTR_TIMER_HOURS, ATTR_TIMER_TIME_ELAPSED_MINS})
+    # Counts minutes while the fan runs, no need to write every step
+    _min_write_interval = 300
+
     def __init__(
         self, coordinator: AtombergDataUpdateCoordinator, device: AtombergDevice
     ) -> None:
@@ -70,3 +90,47 @@ class TimerElapsedTimeSensor(AtombergEntity, SensorEntity):
     def native_value(self) -> int:
         """Get value in minutes."""
         return self.device_state[ATTR_TIMER_TIME_ELAPSED_MINS]
+
+
+class CloudApiLatencySensor(SensorEntity):
+    """Latency of an Atomberg Cloud API endpoint."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_icon = "mdi:timer-sand"
+
+    def __init__(
+        self, entry: ConfigEntry, api: AtombergCloudAPI, endpoint: str
+    ) -> None:
+        """Initialize the entity."""
+        self._api = api
+        self._endpoint = endpoint
+
+        name = endpoint.rsplit("/", 1)[-1]
+        self._attr_unique_id = f"{MANUFACTURER}.{entry.entry_id}_cloud_{name}_latency"
+        self._attr_name = f"{MANUFACTURER} Cloud {name.replace('_', ' ')} latency"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"{entry.entry_id}_cloud")},
+            name=f"{MANUFACTURER} Cloud",
+            manufacturer=MANUFACTURER,
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def native_value(self) -> int | None:
+        """Get p95 latency in milliseconds."""
+        return self._api.metrics.get(self._endpoint).percentile(95)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Get call and error counts."""
+        metrics = self._api.metrics.get(self._endpoint)
+        return {
+            "calls": metrics.calls,
+            "errors": metrics.error_count,
+            "p50": metrics.percentile(50),
+            "p99": metrics.percentile(99),
+        }
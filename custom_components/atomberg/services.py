@@ -0,0 +1,155 @@
+"""Services for Atomberg integration."""
+
+from collections.abc import Mapping
+from logging import getLogger
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+
+from .const import DOMAIN, ENTRIES, MANUFACTURER
+from .device import (
+    ATTR_BRIGHTNESS,
+    ATTR_LED,
+    ATTR_LIGHT_MODE,
+    ATTR_POWER,
+    ATTR_SLEEP,
+    ATTR_SPEED,
+    ATTR_TIMER,
+    ATTR_TIMER_HOURS,
+    LIGHT_MODES,
+    TIMER_MAPPING,
+    AtombergDevice,
+    async_set_group_state,
+)
+
+_LOGGER = getLogger(__name__)
+
+SERVICE_SET_STATE = "set_state"
+SERVICE_GROUP_COMMAND = "group_command"
+
+TARGET_STATE_SCHEMA = {
+    vol.Optional(ATTR_POWER): cv.boolean,
+    vol.Optional(ATTR_SPEED): vol.All(vol.Coerce(int), vol.Range(min=1, max=6)),
+    vol.Optional(ATTR_SLEEP): cv.boolean,
+    vol.Optional(ATTR_LED): cv.boolean,
+    vol.Optional(ATTR_BRIGHTNESS): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    vol.Optional(ATTR_LIGHT_MODE): vol.In(LIGHT_MODES),
+    vol.Optional(ATTR_TIMER_HOURS): vol.All(
+        vol.Coerce(int), vol.In([hours for hours, _ in TIMER_MAPPING])
+    ),
+}
+
+GROUP_COMMAND_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        **TARGET_STATE_SCHEMA,
+    }
+)
+
+
+def target_state_from_service_data(data: dict[str, Any]) -> dict[str, Any]:
+    """Get target state of a device from service data."""
+    target = {k: v for k, v in data.items() if k in TARGET_STATE_SCHEMA}
+    if (hours := target.pop(ATTR_TIMER_HOURS, None)) is not None:
+        target[ATTR_TIMER] = [h for h, _ in TIMER_MAPPING].index(hours)
+    return target
+
+
+def validate_target_state(device: AtombergDevice, target: Mapping[str, Any]) -> None:
+    """Check that a device supports a target state."""
+    if not target:
+        raise ServiceValidationError("No attributes to set were given")
+    if ATTR_BRIGHTNESS in target and not device.supports_brightness_control:
+        raise ServiceValidationError(f"{device.name} doesn't support brightness")
+    if ATTR_LIGHT_MODE in target and not device.supports_color_effect:
+        raise ServiceValidationError(f"{device.name} doesn't support light modes")
+
+
+@callback
+def _async_get_devices(hass: HomeAssistant) -> dict[str, AtombergDevice]:
+    """Get devices of all loaded entries by device identifier."""
+    return {
+        f"{MANUFACTURER}.{device.id}": device
+        for coordinator in hass.data.get(DOMAIN, {}).get(ENTRIES, {}).values()
+        for device in coordinator.devices
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up services of Atomberg integration."""
+
+    async def async_group_command(call: ServiceCall) -> ServiceResponse:
+        """Send the same target state to many devices at once."""
+        devices = _async_get_devices(hass)
+        device_registry = dr.async_get(hass)
+
+        # Device registry id -> Atomberg device
+        resolved: dict[str, AtombergDevice | None] = {}
+        for device_id in call.data[ATTR_DEVICE_ID]:
+            entry = device_registry.async_get(device_id)
+            resolved[device_id] = next(
+                (
+                    devices[identifier]
+                    for domain, identifier in (entry.identifiers if entry else ())
+                    if domain == DOMAIN and identifier in devices
+                ),
+                None,
+            )
+
+        if not (target := target_state_from_service_data(call.data)):
+            raise ServiceValidationError("No attributes to set were given")
+
+        # Atomberg device id -> reason the target doesn't apply to the device
+        unsupported: dict[str, str] = {}
+        for device in resolved.values():
+            if device is None:
+                continue
+            try:
+                validate_target_state(device, target)
+            except ServiceValidationError as e:
+                unsupported[device.id] = str(e)
+
+        device_results = await async_set_group_state(
+            {
+                device.id: device
+                for device in resolved.values()
+                if device and device.id not in unsupported
+            }.values(),
+            target,
+        )
+
+        results: dict[str, dict[str, Any]] = {}
+        for device_id, device in resolved.items():
+            if device is None:
+                results[device_id] = {"success": False, "error": "Unknown device"}
+            elif device.id in unsupported:
+                results[device_id] = {
+                    "success": False,
+                    "error": unsupported[device.id],
+                }
+            elif isinstance(res := device_results[device.id], BaseException):
+                _LOGGER.warning("Group command failed for %s: %s", device.name, res)
+                results[device_id] = {"success": False, "error": str(res)}
+            else:
+                results[device_id] = {"success": res}
+        return {"results": results}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GROUP_COMMAND,
+        async_group_command,
+        schema=GROUP_COMMAND_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
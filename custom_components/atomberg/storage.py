@@ -0,0 +1,23 @@
+"""Persistent storage helpers for the Atomberg integration."""
+
+import hashlib
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+
+
+def storage_key(api_key: str, name: str) -> str:
+    """Get storage key for an account, without leaking the API key."""
+    digest = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    return f"{DOMAIN}.{digest}.{name}"
+
+
+def account_store(
+    hass: HomeAssistant, api_key: str, name: str, private: bool = False
+) -> Store[dict]:
+    """Get a store for data of an account."""
+    return Store(hass, STORAGE_VERSION, storage_key(api_key, name), private=private)
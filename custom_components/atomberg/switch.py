@@ -30,6 +30,8 @@ async def async_setup_entry(
 class AtombergSleepModeSwitchEntity(AtombergEntity, SwitchEntity):
     """Sleep mode entity for atomberg Fan."""
 
+    _state_attributes = frozenset({ATTR_SLEEP})
+
     def __init__(
         self, coordinator: AtombergDataUpdateCoordinator, device: AtombergDevice
     ) -> None:
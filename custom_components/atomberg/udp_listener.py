@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+from collections.abc import Callable
 from logging import getLogger
 
 from homeassistant.config_entries import ConfigEntry
@@ -9,6 +10,8 @@ from homeassistant.core import HomeAssistant
 
 _LOGGER = getLogger(__name__)
 
+Routes = tuple[Callable[[dict], None], Callable[[str, str], None]]
+
 
 class UDPListener(asyncio.DatagramProtocol):
     """UDP Listener."""
@@ -18,7 +21,12 @@ class UDPListener(asyncio.DatagramProtocol):
         self.hass = hass
         self.devices = {}
         self._listener = None
-        self._callbacks = {}
+        self._callbacks: dict[str, tuple[Routes, list[str]]] = {}
+        # device_id -> (message, repeat) callbacks of the entries owning the device
+        self._routes: dict[str, list[Routes]] = {}
+        # Last raw datagram of each device, to skip decoding repeated broadcasts
+        self._last_frames: dict[str, bytes] = {}
+        self._frame_devices: dict[bytes, tuple[str, str | None]] = {}
 
     def parse_datagram(self, data, addr) -> tuple[str, str]:
         """Decode and parse the data."""
@@ -35,6 +43,13 @@ class UDPListener(asyncio.DatagramProtocol):
 
     def datagram_received(self, data, addr):
         """Decode data when broadcast received."""
+        if (frame := self._frame_devices.get(data)) is not None:
+            # Same payload as the last one of this device, only refresh presence
+            device_id, proxy_ip = frame
+            for _, repeat_callback in self._routes.get(device_id, ()):
+                repeat_callback(device_id, proxy_ip or addr[0])
+            return
+
         message, ip_addr = self.parse_datagram(data, addr)
         _LOGGER.debug("Message received %s from %s", message, ip_addr)
 
@@ -46,16 +61,48 @@ class UDPListener(asyncio.DatagramProtocol):
         except ValueError:
             msg_data.update({"device_id": message.split("_")[0]})
 
-        for func in self._callbacks.values():
-            func(msg_data)
-
-    def add_callback(self, entry: ConfigEntry, callback):
-        """Add a callback."""
-        self._callbacks[entry.entry_id] = callback
+        device_id = msg_data["device_id"]
+        self._remember_frame(device_id, data, ip_addr if ip_addr != addr[0] else None)
+        for message_callback, _ in self._routes.get(device_id, ()):
+            message_callback(msg_data)
+
+    def _remember_frame(self, device_id: str, data: bytes, proxy_ip: str | None):
+        """Remember the last datagram of a device."""
+        self._forget_frame(device_id)
+        self._last_frames[device_id] = data
+        self._frame_devices[data] = (device_id, proxy_ip)
+
+    def _forget_frame(self, device_id: str):
+        """Forget the last datagram of a device."""
+        if (old := self._last_frames.pop(device_id, None)) is not None:
+            self._frame_devices.pop(old, None)
+
+    def add_callback(
+        self,
+        entry: ConfigEntry,
+        callback: Callable[[dict], None],
+        repeat_callback: Callable[[str, str], None],
+        device_ids: list[str],
+    ):
+        """Add callbacks for messages and repeated messages of given devices."""
+        self.remove_callback(entry)
+        routes = (callback, repeat_callback)
+        self._callbacks[entry.entry_id] = (routes, device_ids)
+        for device_id in device_ids:
+            self._routes.setdefault(device_id, []).append(routes)
+            # Make sure the new callback sees a full message first
+            self._forget_frame(device_id)
 
     def remove_callback(self, entry: ConfigEntry):
         """Remove a callback."""
-        self._callbacks.pop(entry.entry_id, None)
+        if not (item := self._callbacks.pop(entry.entry_id, None)):
+            return
+        routes, device_ids = item
+        for device_id in device_ids:
+            device_routes = self._routes[device_id]
+            device_routes.remove(routes)
+            if not device_routes:
+                del self._routes[device_id]
 
     async def start(self):
         """Start listening."""
@@ -69,5 +116,8 @@ class UDPListener(asyncio.DatagramProtocol):
         """Close listener."""
         if self._listener:
             self._callbacks.clear()
+            self._routes.clear()
+            self._last_frames.clear()
+            self._frame_devices.clear()
             self._listener[0].close()
             _LOGGER.debug("Closed UDP listener on port 5625")
@@ -0,0 +1,96 @@
+"""UDP Sender for Atomberg integration."""
+
+import asyncio
+import socket
+from logging import getLogger
+from typing import Any
+
+_LOGGER = getLogger(__name__)
+
+COMMAND_PORT = 5600
+# Commands allowed to wait while the socket buffer is full, further ones are dropped
+MAX_QUEUED_COMMANDS = 64
+
+
+class UDPSender(asyncio.DatagramProtocol):
+    """Shared non-blocking transport for commands sent to devices over UDP."""
+
+    def __init__(self, max_queued: int = MAX_QUEUED_COMMANDS) -> None:
+        """Init UDP Sender."""
+        self._transport: asyncio.DatagramTransport | None = None
+        self._max_queued = max_queued
+        self._queued = 0
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self.sent = 0
+        self.dropped = 0
+        self.errors = 0
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Get counters of the sender."""
+        return {
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "queued": self._queued,
+            "paused": not self._writable.is_set(),
+        }
+
+    def pause_writing(self) -> None:
+        """Hold back commands while the socket buffer is full."""
+        _LOGGER.debug("UDP send buffer full, queueing commands")
+        self._writable.clear()
+
+    def resume_writing(self) -> None:
+        """Release queued commands."""
+        self._writable.set()
+
+    def error_received(self, exc: Exception) -> None:
+        """Count errors reported by the socket."""
+        self.errors += 1
+        _LOGGER.debug("Error sending UDP command: %s", exc)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Forget the transport."""
+        self._transport = None
+        # Wake up waiting commands, they find the transport gone
+        self._writable.set()
+
+    async def async_send(self, data: bytes, ip_address: str) -> bool:
+        """Send datagram to the command port of a device."""
+        if not self._writable.is_set():
+            if self._queued >= self._max_queued:
+                self.dropped += 1
+                _LOGGER.warning(
+                    "UDP send queue full, dropping command to %s", ip_address
+                )
+                return False
+            self._queued += 1
+            try:
+                await self._writable.wait()
+            finally:
+                self._queued -= 1
+
+        if self._transport is None or self._transport.is_closing():
+            self.dropped += 1
+            return False
+
+        self._transport.sendto(data, (ip_address, COMMAND_PORT))
+        self.sent += 1
+        return True
+
+    async def start(self):
+        """Open the transport."""
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: self, family=socket.AF_INET
+        )
+        _LOGGER.debug("Opened UDP transport for commands")
+
+    def close(self):
+        """Close the transport."""
+        if self._transport:
+            self._transport.close()
+            self._transport = None
+            _LOGGER.debug("Closed UDP transport for commands")
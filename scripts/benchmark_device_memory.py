@@ -0,0 +1,112 @@
+"""Benchmark memory held per device.
+
+Measures with tracemalloc the bytes allocated per device for its state, as
+the dict the cloud API returns and as the `DeviceState` the integration keeps
+after normalising it, and for a whole `AtombergDevice` with its device list
+entry.
+
+Run from the repository root with the development dependencies installed:
+
+    python scripts/benchmark_device_memory.py
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.atomberg.api import normalize_device_state  # noqa: E402
+from custom_components.atomberg.device import (  # noqa: E402
+    AtombergDevice,
+    DeviceState,
+)
+
+DEVICE_COUNTS = (10, 100, 1000)
+
+
+def cloud_state(i: int) -> dict[str, Any]:
+    """Build a state of a device as received from the cloud API."""
+    return {
+        "is_online": False,
+        "power": bool(i % 2),
+        "last_recorded_speed": i % 6 + 1,
+        "sleep_mode": False,
+        "led": True,
+        "timer_hours": 0,
+        "timer_time_elapsed_mins": 0,
+        "last_recorded_brightness": 50,
+        "last_recorded_color": "warm",
+        "ts_epoch_seconds": 1700000000 + i,
+    }
+
+
+def device_state(i: int) -> dict[str, Any]:
+    """Build a normalised state of a device."""
+    state = cloud_state(i)
+    normalize_device_state(state)
+    return state
+
+
+def device_data(i: int) -> dict[str, Any]:
+    """Build a device list entry of the cloud API."""
+    return {
+        "device_id": f"{i:012x}",
+        "color": "Earth Brown",
+        "series": "I1",
+        "model": "Renesa+",
+        "room": "Living Room",
+        "name": f"Fan {i}",
+        "metadata": {"ssid": "Home"},
+        "state": device_state(i),
+    }
+
+
+def bytes_per_object(factory: Callable[[int], Any], count: int) -> float:
+    """Get bytes allocated per object kept alive, created by `factory`."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        objects = [factory(i) for i in range(count)]
+        gc.collect()
+        allocated = tracemalloc.get_traced_memory()[0] - sys.getsizeof(objects)
+    finally:
+        tracemalloc.stop()
+    del objects
+    return allocated / count
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "counts", nargs="*", type=int, default=DEVICE_COUNTS, help="Device counts"
+    )
+    args = parser.parse_args()
+
+    hass, api, sender = MagicMock(), MagicMock(), MagicMock()
+    benchmarks = {
+        "cloud dict": cloud_state,
+        "DeviceState": lambda i: DeviceState.from_mapping(device_state(i)),
+        "device": lambda i: AtombergDevice(hass, device_data(i), api, sender),
+    }
+
+    print(f"{'devices':>8}" + "".join(f" {name:>12}" for name in benchmarks))
+    for count in args.counts:
+        print(
+            f"{count:>8}"
+            + "".join(
+                f" {bytes_per_object(factory, count):>12.0f}"
+                for factory in benchmarks.values()
+            )
+        )
+    print("Bytes per device, the device includes its device list entry")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark syncing the device list of an account from the cloud.
+
+Times `AtombergCloudAPI.async_sync_list_of_devices` with the cloud requests
+stubbed out, for an increasing number of devices. The time per device should
+stay flat as the account grows, i.e. the sync scales linearly.
+
+Run from the repository root with the development dependencies installed:
+
+    python scripts/benchmark_device_sync.py
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.atomberg import api as api_module  # noqa: E402
+from custom_components.atomberg import auth as auth_module  # noqa: E402
+
+DEVICE_COUNTS = (10, 100, 1000, 2000, 5000, 10000)
+SERIES = sorted(api_module.SUPPORTED_SERIES)
+
+
+def device_list_response(count: int) -> dict[str, Any]:
+    """Build a list of devices response of the cloud API."""
+    return {
+        "status": "Success",
+        "message": {
+            "devices_list": [
+                {
+                    "device_id": f"{i:012x}",
+                    "color": "Earth Brown",
+                    "series": SERIES[i % len(SERIES)],
+                    "model": "Renesa+",
+                    "room": "Living Room",
+                    "name": f"Fan {i}",
+                    "metadata": {"ssid": "Home"},
+                }
+                for i in range(count)
+            ]
+        },
+    }
+
+
+def device_state_response(count: int) -> dict[str, Any]:
+    """Build a state of all devices response of the cloud API."""
+    return {
+        "status": "Success",
+        "message": {
+            "device_state": [
+                {
+                    "device_id": f"{i:012x}",
+                    "is_online": True,
+                    "power": bool(i % 2),
+                    "last_recorded_speed": i % 6 + 1,
+                    "sleep_mode": False,
+                    "led": True,
+                    "timer_hours": 0,
+                    "timer_time_elapsed_mins": 0,
+                    "last_recorded_brightness": 50,
+                    "last_recorded_color": "warm",
+                    "ts_epoch_seconds": 1700000000,
+                }
+                for i in range(count)
+            ]
+        },
+    }
+
+
+def make_api() -> api_module.AtombergCloudAPI:
+    """Create a cloud API client without a session or storage."""
+    with (
+        patch.object(api_module, "async_get_clientsession"),
+        patch.object(api_module, "account_store"),
+        patch.object(auth_module, "account_store"),
+    ):
+        return api_module.AtombergCloudAPI(MagicMock(), "api_key", "refresh_token")
+
+
+async def async_time_sync(count: int, repeat: int) -> tuple[float, float]:
+    """Get best times of a first sync and of a resync of `count` devices."""
+    api = make_api()
+    responses: dict[str, dict[str, Any]] = {}
+
+    async def async_make_request(url: str, **kwargs: Any) -> dict[str, Any]:
+        return responses[url.split("?", 1)[0]]
+
+    api.async_make_request = async_make_request
+
+    first = resync = float("inf")
+    for _ in range(repeat):
+        for existing in (False, True):
+            if not existing:
+                api.device_list.clear()
+            # Responses are normalised in place, so every sync needs fresh ones
+            responses[api_module.ENDPOINT_GET_LIST_OF_DEVICES] = device_list_response(
+                count
+            )
+            responses[api_module.ENDPOINT_GET_DEVICE_STATE] = device_state_response(
+                count
+            )
+            start = time.perf_counter()
+            assert await api.async_sync_list_of_devices()
+            elapsed = time.perf_counter() - start
+            assert len(api.device_list) == count
+            if existing:
+                resync = min(resync, elapsed)
+            else:
+                first = min(first, elapsed)
+    return first, resync
+
+
+async def async_main(counts: list[int], repeat: int) -> None:
+    """Run the benchmark."""
+    print(
+        f"{'devices':>8} {'first ms':>10} {'us/device':>10}"
+        f" {'resync ms':>10} {'us/device':>10}"
+    )
+    for count in counts:
+        first, resync = await async_time_sync(count, repeat)
+        print(
+            f"{count:>8} {first * 1e3:>10.2f} {first / count * 1e6:>10.2f}"
+            f" {resync * 1e3:>10.2f} {resync / count * 1e6:>10.2f}"
+        )
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "counts", nargs="*", type=int, default=DEVICE_COUNTS, help="Device counts"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs per count, the best is shown"
+    )
+    args = parser.parse_args()
+    asyncio.run(async_main(args.counts, args.repeat))
+
+
+if __name__ == "__main__":
+    main()